@@ -0,0 +1,241 @@
+from multiprocessing import Value
+import chess
+from ai.algorithms.base import AIAlgorithm
+from ai.evaluation.simple_net_evaluation import evaluate_board_with_simple_net, evaluate_boards_with_simple_net
+from ai.evaluation.simple_net_accumulator import SimpleNetAccumulator
+from ai.search import (
+    TranspositionTable, SharedTranspositionTable, QuiescenceSearch, MoveOrderer, LeafBatcher, LEAF_BATCH_SIZE,
+    SearchLimits, SearchTimeout, SearchState, EXACT, LOWER_BOUND, UPPER_BOUND, bound_flag, restore_board
+)
+
+# Nodes a process counts before adding them to the shared node count
+NODE_FLUSH_INTERVAL = 64
+
+
+class AlphaBetaSearch(AIAlgorithm):
+    """
+    The parts NegamaxAlphaBeta and IDPVS share: the transposition table,
+    move ordering, quiescence at the leaves, batched frontier children and
+    the counters workers send back. With incremental_eval, the net's first
+    layer is kept up to date on every push and pop (SimpleNetAccumulator)
+    instead of being recomputed for every evaluated position.
+    """
+
+    def __init__(self, depth=3, parallel=False, num_workers=None, tt_size_mb=None, quiescence=True,
+                 leaf_batch_size=LEAF_BATCH_SIZE, incremental_eval=True):
+        super().__init__(parallel=parallel, num_workers=num_workers)
+        self.depth = depth
+        self.incremental_eval = incremental_eval
+        self.nodes = 0
+        self.worker_nodes = 0
+        self.worker_qnodes = 0
+        self.search_stats = {}
+        self.limits = SearchLimits()
+        self.move_orderer = MoveOrderer()
+        # Resolve captures at the leaves instead of evaluating mid-exchange
+        self.quiescence = QuiescenceSearch(self.static_eval) if quiescence else None
+        self.leaf_batcher = LeafBatcher(evaluate_boards_with_simple_net, leaf_batch_size)
+        # Parallel workers share one table so they don't redo each other's work
+        self.transposition_table = None
+        if tt_size_mb:
+            table_cls = SharedTranspositionTable if self.num_workers > 1 else TranspositionTable
+            self.transposition_table = table_cls(size_mb=tt_size_mb)
+        # Nodes searched by all processes, so workers can see the node budget run out
+        self.shared_nodes = Value('q', 0) if self.num_workers > 1 else None
+        self.flushed_nodes = 0
+        self.shared_seen = 0
+
+    def new_search(self):
+        if self.transposition_table is not None:
+            self.transposition_table.new_search()
+        self.move_orderer.new_search()
+        self.reset_stats()
+        if self.shared_nodes is not None:
+            self.shared_nodes.value = 0
+            self.shared_seen = 0
+
+    def count_node(self):
+        """
+        Counts a node; raises SearchTimeout once the limits run out.
+        """
+        self.nodes += 1
+        if self.shared_nodes is not None and self.nodes - self.flushed_nodes >= NODE_FLUSH_INTERVAL:
+            self.flush_nodes()
+        if self.limits.should_stop(self.budget_nodes()):
+            raise SearchTimeout
+
+    def flush_nodes(self):
+        """
+        Adds this process' new nodes to the shared count and reads it back.
+        """
+        with self.shared_nodes.get_lock():
+            self.shared_nodes.value += self.nodes - self.flushed_nodes
+            self.shared_seen = self.shared_nodes.value
+        self.flushed_nodes = self.nodes
+
+    def budget_nodes(self):
+        """
+        Nodes counted against the node budget. In parallel mode that is every
+        process' nodes, each at most NODE_FLUSH_INTERVAL behind.
+        """
+        if self.shared_nodes is None:
+            return self.nodes
+        return self.shared_seen + self.nodes - self.flushed_nodes
+
+    def out_of_limits(self):
+        """
+        Check between iterations, with the shared node count brought up to date.
+        """
+        if self.shared_nodes is not None:
+            self.flush_nodes()
+        return self.limits.should_stop(self.budget_nodes())
+
+    def new_state(self, board):
+        """
+        The SearchState a search runs on, with an accumulator if incremental_eval is on.
+        """
+        return SearchState(board, SimpleNetAccumulator(board) if self.incremental_eval else None)
+
+    def static_eval(self, board, state=None):
+        """
+        The simple net's blended score (White's view), from the state's
+        accumulator when it has one.
+        """
+        if state is not None and state.accumulator is not None:
+            return state.accumulator.evaluate()
+        return evaluate_board_with_simple_net(board, state)
+
+    def probe(self, state, depth, alpha, beta):
+        """
+        Looks the position up in the transposition table.
+        Returns (score to cut off with or None, alpha, beta, hash move).
+        """
+        if self.transposition_table is None:
+            return None, alpha, beta, None
+        entry = self.transposition_table.probe(state.key)
+        if entry is None:
+            return None, alpha, beta, None
+        stored_depth, stored_eval, flag, hash_move = entry
+        if stored_depth >= depth:
+            if flag == EXACT:
+                return stored_eval, alpha, beta, hash_move
+            elif flag == LOWER_BOUND:
+                alpha = max(alpha, stored_eval)
+            elif flag == UPPER_BOUND:
+                beta = min(beta, stored_eval)
+            if alpha >= beta:
+                return stored_eval, alpha, beta, hash_move
+        return None, alpha, beta, hash_move
+
+    def store(self, state, depth, score, flag, move=None):
+        if self.transposition_table is not None:
+            self.transposition_table.store(state.key, depth, score, flag, move)
+
+    def evaluate_leaf(self, state, depth, alpha, beta, color, alpha_orig, game_over, static_eval=None):
+        """
+        Scores a node with no depth left or no moves: quiescence search, or
+        the static eval if that's off or the game is over. The result is
+        stored as a bound of the node's original window (alpha_orig, beta).
+        static_eval (White's view) is passed to leaves already scored in a batch.
+        """
+        if static_eval is None and (game_over or self.quiescence is None):
+            static_eval = self.static_eval(state.board, state)
+        if game_over or self.quiescence is None:
+            eval = color * static_eval
+            flag = EXACT
+        else:
+            stand_pat = color * static_eval if static_eval is not None else None
+            eval = self.quiescence.search(state, alpha, beta, color, stand_pat=stand_pat)
+            flag = bound_flag(eval, alpha_orig, beta)
+        self.store(state, depth, eval, flag)
+        return eval
+
+    def child_evals(self, board, moves, depth):
+        """
+        Batched static evals for the children of a frontier node, or None.
+        The accumulator scores a leaf for less than its share of a batched
+        forward pass, so there are no batches with incremental_eval.
+        """
+        if depth == 1 and self.leaf_batcher.batch_size and not self.incremental_eval:
+            return self.leaf_batcher.child_evals(board, moves)
+        return None
+
+    def unwind(self, state, root_ply):
+        """
+        Takes back whatever an interrupted search left on the board.
+        """
+        while len(state.board.move_stack) > root_ply:
+            state.pop()
+
+    def worker_state(self, position, move_uci, limits):
+        """
+        Sets a pool worker up for one root move: the position after it (with
+        the game moves a repetition can reach), fresh counters and the
+        parent's limits. position comes from compact_board.
+        """
+        board = restore_board(*position)
+        board.push_uci(move_uci)
+        self.reset_stats()
+        self.limits = limits
+        self.shared_seen = self.shared_nodes.value
+        return self.new_state(board)
+
+    def reset_stats(self):
+        self.nodes = 0
+        self.flushed_nodes = 0
+        self.worker_nodes = 0
+        self.worker_qnodes = 0
+        self.move_orderer.reset_stats()
+        self.leaf_batcher.reset_stats()
+        if self.quiescence is not None:
+            self.quiescence.nodes = 0
+        if self.transposition_table is not None:
+            self.transposition_table.reset_stats()
+
+    def qnodes(self):
+        return self.quiescence.nodes if self.quiescence is not None else 0
+
+    def total_nodes(self):
+        return self.nodes + self.worker_nodes
+
+    def worker_stats(self):
+        """
+        The counters a worker sends back with its result. Also hands its
+        last nodes to the shared count.
+        """
+        self.flush_nodes()
+        stats = {
+            "nodes": self.nodes, "qnodes": self.qnodes(),
+            **self.move_orderer.stats(), **self.leaf_batcher.stats(),
+        }
+        if self.transposition_table is not None:
+            stats.update(self.transposition_table.counters())
+        return stats
+
+    def add_worker_stats(self, stats):
+        self.worker_nodes += stats["nodes"]
+        self.worker_qnodes += stats["qnodes"]
+        self.move_orderer.add_stats(stats)
+        self.leaf_batcher.add_stats(stats)
+        if self.transposition_table is not None:
+            self.transposition_table.add_stats(stats)
+
+    def stats(self):
+        """
+        Counters for search_stats, workers included.
+        """
+        stats = {
+            "nodes": self.total_nodes(),
+            "qnodes": self.qnodes() + self.worker_qnodes,
+            **self.move_orderer.stats(),
+            **self.leaf_batcher.stats(),
+        }
+        if self.transposition_table is not None:
+            stats.update(self.transposition_table.stats())
+        if self.parallel and self.num_workers > 1:
+            stats["serial_nodes"] = self.nodes
+            stats["worker_nodes"] = self.worker_nodes
+        return stats
+
+    def warm_up(self):
+        evaluate_board_with_simple_net(chess.Board())
@@ -1,15 +1,44 @@
+import weakref
 from abc import ABC, abstractmethod
+from multiprocessing import Pool
 import chess
+from ai.search.limits import SearchLimits, MAX_SEARCH_DEPTH
+
+# The algorithm copy living inside each pool worker process
+_WORKER_ALGORITHM = None
+
+
+def _init_worker(algorithm):
+    """
+    Runs once when a pool worker starts: keep the algorithm around and warm it up.
+    """
+    global _WORKER_ALGORITHM
+    _WORKER_ALGORITHM = algorithm
+    algorithm.warm_up()
+
+
+def _run_in_worker(task):
+    """
+    Calls a method on the worker's algorithm copy.
+    """
+    method_name, args = task
+    return getattr(_WORKER_ALGORITHM, method_name)(args)
+
 
 class AIAlgorithm(ABC):
     """
     A simple base class for all AI-based chess strategies.
     It sets a common interface so each AI can pick moves in its own style.
     """
-    
-    def __init__(self, parallel=False):
+
+    _pool = None
+
+    def __init__(self, parallel=False, num_workers=None):
         self.parallel = parallel
-        self.num_workers = self.get_num_workers() if parallel else 1
+        if parallel:
+            self.num_workers = num_workers or self.get_num_workers()
+        else:
+            self.num_workers = 1
 
     @staticmethod
     def get_num_workers():
@@ -23,10 +52,84 @@ class AIAlgorithm(ABC):
         except NotImplementedError:
             return 1
 
+    def __getstate__(self):
+        # The pool belongs to the parent process; workers get everything else
+        state = self.__dict__.copy()
+        state.pop("_pool", None)
+        state.pop("_pool_finalizer", None)
+        return state
+
+    def get_pool(self):
+        """
+        Returns the worker pool, starting it on first use.
+        The pool lives as long as the algorithm, so workers (and their loaded
+        models) are reused across iterations and moves until close() is called.
+        """
+        if self._pool is None:
+            self._pool = Pool(self.num_workers, initializer=_init_worker, initargs=(self,))
+            self._pool_finalizer = weakref.finalize(self, self._pool.terminate)
+        return self._pool
+
+    def map_workers(self, method_name, tasks):
+        """
+        Runs self.<method_name>(task) for every task on the worker pool.
+        """
+        return self.get_pool().map(_run_in_worker, [(method_name, task) for task in tasks])
+
+    def imap_workers(self, method_name, tasks):
+        """
+        Like map_workers, but yields results as soon as each task finishes.
+        """
+        return self.get_pool().imap_unordered(_run_in_worker, [(method_name, task) for task in tasks])
+
+    def prepare_limits(self, depth=None, limits=None, check_interval=16):
+        """
+        Starts the clock for a search and works out its maximum depth:
+        an explicit depth wins, then the limits' depth; a search bounded only
+        by time or nodes may go as deep as it can, otherwise self.depth is used.
+        Returns (depth, started limits).
+        """
+        limits = limits if limits is not None else SearchLimits()
+        limits.start(check_interval)
+        if not depth:
+            if limits.depth:
+                depth = limits.depth
+            elif limits.is_bounded():
+                depth = MAX_SEARCH_DEPTH
+            else:
+                depth = getattr(self, "depth", None)
+        return depth, limits
+
+    def warm_up(self):
+        """
+        Called once in each new worker so the first real task doesn't pay for
+        start-up work like the first model call. Override if there is any.
+        """
+        pass
+
+    def close(self):
+        """
+        Shuts down the worker pool, if one was started.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool_finalizer.detach()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     @abstractmethod
-    def get_best_move(self, board: chess.Board, history: list = None, depth: int = None) -> chess.Move:
+    def get_best_move(self, board: chess.Board, history: list = None, depth: int = None,
+                      limits: SearchLimits = None) -> chess.Move:
         """
         Given a board, pick a good move.
         Different AIs will fill in their own unique methods.
+        With limits (time, nodes, clock), return the best move found so far
+        once they run out.
         """
         pass
@@ -1,6 +1,7 @@
 import chess
 from ai.algorithms.base import AIAlgorithm
 from ai.evaluation.simple_net_evaluation import evaluate_board_with_simple_net
+from ai.search import SearchLimits, SearchTimeout
 
 
 class Heuristic(AIAlgorithm):
@@ -11,21 +12,33 @@ class Heuristic(AIAlgorithm):
     def __init__(self, depth: int = 3):
         self.depth = depth
 
-    def get_best_move(self, board: chess.Board, history: list = None) -> chess.Move:
+    def get_best_move(self, board: chess.Board, history: list = None, depth: int = None,
+                      limits: SearchLimits = None) -> chess.Move:
         """
         Pick the best move by searching ahead a few moves.
+        If the limits run out, the best root move searched so far is returned.
         """
+        self.limits = (limits if limits is not None else SearchLimits()).start()
+        depth = depth or self.limits.depth or self.depth
+        self.nodes = 0
         best_move = None
         max_score = float('-inf')
+        root_ply = len(board.move_stack)
 
-        for move in board.legal_moves:
-            board.push(move)
-            score = self.minimax(board, self.depth - 1, False, float('-inf'), float('inf'))
-            board.pop()
+        try:
+            for move in board.legal_moves:
+                board.push(move)
+                score = self.minimax(board, depth - 1, False, float('-inf'), float('inf'))
+                board.pop()
 
-            if score > max_score:
-                max_score = score
-                best_move = move
+                if score > max_score:
+                    max_score = score
+                    best_move = move
+        except SearchTimeout:
+            while len(board.move_stack) > root_ply:
+                board.pop()
+            if best_move is None:
+                best_move = next(iter(board.legal_moves), None)
 
         return best_move
 
@@ -33,6 +46,9 @@ class Heuristic(AIAlgorithm):
         """
         Basic minimax with alpha-beta pruning to evaluate moves.
         """
+        self.nodes += 1
+        if self.limits.should_stop(self.nodes):
+            raise SearchTimeout
         if depth == 0 or board.is_game_over():
             return evaluate_board_with_simple_net(board)
 
@@ -1,154 +1,453 @@
 import chess
-from multiprocessing import Pool
-from ai.algorithms.base import AIAlgorithm
-from ai.evaluation.simple_net_evaluation import evaluate_board_with_simple_net
+from ai.algorithms.alpha_beta import AlphaBetaSearch
+from ai.search import LEAF_BATCH_SIZE, SearchLimits, SearchTimeout, position_key, bound_flag, compact_board
 
+# Half-width of the first aspiration window around the previous score (centipawns)
+ASPIRATION_WINDOW = 50
 
-class IDPVS(AIAlgorithm):
+# Selective search settings (depths in plies, margins in centipawns)
+NULL_MOVE_MIN_DEPTH = 3
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_VERIFY_DEPTH = 6
+LMR_MIN_DEPTH = 3
+LMR_MIN_MOVES = 3
+FUTILITY_MAX_DEPTH = 3
+FUTILITY_MARGIN = 120
+RAZOR_MAX_DEPTH = 2
+RAZOR_MARGINS = {1: 300, 2: 500}
+
+
+class IDPVS(AlphaBetaSearch):
     """
     Uses Iterative Deepening Principal Variation Search to find moves.
+
+    Selective search features, each can be switched off for comparison:
+    - null_move: give the opponent a free move; if we're still above beta
+      with a reduced search, prune. Skipped without pieces (zugzwang risk)
+      and verified by a normal reduced search at high depth.
+    - late_move_reductions: search late quiet moves one or two plies
+      shallower, re-searching at full depth if they beat alpha.
+    - futility_pruning: reverse futility; near the leaves, prune when the
+      static eval is above beta by a depth-scaled margin.
+    - razoring: near the leaves, when the static eval is far below alpha,
+      drop into quiescence and prune if it confirms.
+
+    Positions are scored incrementally (incremental_eval); without it,
+    leaf_batch_size sets how many children of a depth-1 node are scored per
+    forward pass (0 evaluates every leaf on its own).
     """
 
-    def __init__(self, depth=3, parallel=False):
-        super().__init__(parallel=parallel)
-        self.depth = depth
-        self.transposition_table = {}
+    def __init__(self, depth=3, parallel=False, tt_size_mb=16, quiescence=True, num_workers=None,
+                 null_move=True, late_move_reductions=True, futility_pruning=True, razoring=True,
+                 leaf_batch_size=LEAF_BATCH_SIZE, incremental_eval=True):
+        super().__init__(depth=depth, parallel=parallel, num_workers=num_workers, tt_size_mb=tt_size_mb,
+                         quiescence=quiescence, leaf_batch_size=leaf_batch_size, incremental_eval=incremental_eval)
+        self.null_move = null_move
+        self.late_move_reductions = late_move_reductions
+        self.futility_pruning = futility_pruning
+        self.razoring = razoring
+        self.pruning_stats = self.empty_pruning_stats()
 
-    def get_best_move(self, board: chess.Board, history: list = None, depth: int = None) -> chess.Move:
-        depth = depth or self.depth
+    def get_best_move(self, board: chess.Board, history: list = None, depth: int = None,
+                      limits: SearchLimits = None) -> chess.Move:
+        return self.search(board, history, depth, limits)[0]
+
+    def search(self, board: chess.Board, history: list = None, depth: int = None, limits: SearchLimits = None):
+        """
+        Runs the full iterative deepening search, stopping early (with the
+        best move so far) if the limits run out.
+        Repetitions are detected from the board's own move stack, so history
+        is only kept for API compatibility.
+        Returns (best move, score, principal variation as a list of moves).
+        """
+        depth, self.limits = self.prepare_limits(depth, limits)
+        self.new_search()
+        self.researches = 0
+        self.completed_depth = 0
         if self.parallel and self.num_workers > 1:
-            return self.idpvs_parallel(board, depth, history)
+            best_move, score = self.idpvs_parallel(board, depth)
         else:
-            return self.idpvs_sequential(board, depth, history)
+            best_move, score = self.idpvs_sequential(self.new_state(board), depth)
+        # Taken before the PV walk, whose table probes aren't part of the search
+        stats = self.stats()
+        pv = self.principal_variation(board, best_move, depth)
+        self.search_stats = {
+            "depth": self.completed_depth,
+            "time": self.limits.elapsed(),
+            "researches": self.researches,
+            "score": score,
+            "pv": [move.uci() for move in pv],
+            **stats,
+            **self.pruning_stats,
+        }
+        return best_move, score, pv
+
+    @staticmethod
+    def empty_pruning_stats():
+        return {"null_move_cutoffs": 0, "futility_prunes": 0, "razor_prunes": 0, "lmr_researches": 0}
 
-    def idpvs(self, board, depth, alpha, beta, color, history):
+    def reset_stats(self):
+        super().reset_stats()
+        self.pruning_stats = self.empty_pruning_stats()
+
+    def worker_stats(self):
+        return {**super().worker_stats(), **self.pruning_stats}
+
+    def add_worker_stats(self, stats):
+        super().add_worker_stats(stats)
+        for name in self.pruning_stats:
+            self.pruning_stats[name] += stats[name]
+
+    def idpvs(self, state, depth, alpha, beta, color, allow_null=True, static_eval=None):
         """
         Principal Variation Search with alpha-beta pruning.
+        allow_null is off right after a null move, so two never follow each other.
+        static_eval (White's view) is passed to leaves already scored in a batch.
         """
-        fen = board.fen()
+        self.count_node()
+        # Repetitions and 50-move draws depend on the path, so don't cache them
+        if state.is_draw():
+            return 0
+        board = state.board
+        alpha_orig = alpha
 
         # Check if we’ve seen this position before
-        if fen in self.transposition_table:
-            stored_depth, stored_eval = self.transposition_table[fen]
-            if stored_depth >= depth:
-                return stored_eval
+        cutoff, alpha, beta, hash_move = self.probe(state, depth, alpha, beta)
+        if cutoff is not None:
+            return cutoff
 
         # If no depth left or game ended, just evaluate
-        if depth == 0 or board.is_game_over():
-            eval = color * evaluate_board_with_simple_net(board, history)
-            self.transposition_table[fen] = (depth, eval)
-            return eval
+        game_over = not any(board.generate_legal_moves())
+        if depth == 0 or game_over:
+            return self.evaluate_leaf(state, depth, alpha, beta, color, alpha_orig, game_over, static_eval)
+
+        in_check = board.is_check()
+        pv_node = beta - alpha > 1
+        if not in_check and not pv_node:
+            pruned = self.prune(state, depth, alpha, beta, color, allow_null)
+            if pruned is not None:
+                return pruned
 
         max_eval = float('-inf')
-        first_move = True
-
-        for move in self.order_moves(board):
-            if move.promotion:
-                # Try all promotions
-                for promotion_piece in [chess.QUEEN, chess.KNIGHT, chess.ROOK, chess.BISHOP]:
-                    move.promotion = promotion_piece
-                    board.push(move)
-                    history.append(fen)
-                    eval = -self.idpvs(board, depth - 1, -beta, -alpha, -color, history)
-                    history.pop()
-                    board.pop()
-                    max_eval = max(max_eval, eval)
-                    alpha = max(alpha, eval)
-                    if alpha >= beta:
-                        break
+        best_move = None
+
+        # legal_moves already lists every promotion piece separately
+        moves = self.move_orderer.order_moves(board, hash_move)
+        # The children of a frontier node are leaves: score them in batches
+        child_evals = self.child_evals(board, moves, depth)
+        for i, move in enumerate(moves):
+            child_eval = next(child_evals) if child_evals is not None else None
+            quiet = not move.promotion and not board.is_capture(move)
+            state.push(move)
+            if i == 0:
+                eval = -self.idpvs(state, depth - 1, -beta, -alpha, -color, static_eval=child_eval)
             else:
-                board.push(move)
-                history.append(fen)
-                if first_move:
-                    eval = -self.idpvs(board, depth - 1, -beta, -alpha, -color, history)
-                    first_move = False
-                else:
-                    eval = -self.idpvs(board, depth - 1, -alpha - 1, -alpha, -color, history)
-                    if alpha < eval < beta:
-                        eval = -self.idpvs(board, depth - 1, -beta, -alpha, -color, history)
-                history.pop()
-                board.pop()
-
-                max_eval = max(max_eval, eval)
-                alpha = max(alpha, eval)
-                if alpha >= beta:
-                    break
+                reduction = 0
+                if (self.late_move_reductions and quiet and not in_check and i >= LMR_MIN_MOVES
+                        and depth >= LMR_MIN_DEPTH and not board.is_check()):
+                    reduction = 1 if i < 2 * LMR_MIN_MOVES else 2
+                    reduction = min(reduction, depth - 1)
+                eval = -self.idpvs(state, depth - 1 - reduction, -alpha - 1, -alpha, -color,
+                                   static_eval=child_eval)
+                if reduction and eval > alpha:
+                    self.pruning_stats["lmr_researches"] += 1
+                    eval = -self.idpvs(state, depth - 1, -alpha - 1, -alpha, -color)
+                if alpha < eval < beta:
+                    eval = -self.idpvs(state, depth - 1, -beta, -alpha, -color, static_eval=child_eval)
+            state.pop()
 
-        self.transposition_table[fen] = (depth, max_eval)
+            if eval > max_eval:
+                max_eval = eval
+                best_move = move
+            alpha = max(alpha, eval)
+            if alpha >= beta:
+                self.move_orderer.record_cutoff(board, move, depth, i)
+                break
+
+        self.store(state, depth, max_eval, bound_flag(max_eval, alpha_orig, beta), best_move)
         return max_eval
 
-    def idpvs_sequential(self, board, depth, history):
+    def prune(self, state, depth, alpha, beta, color, allow_null):
+        """
+        Tries the enabled pruning tricks at a non-PV node that isn't in check.
+        Returns a score to cut off with, or None to search the node normally.
+        """
+        board = state.board
+        use_futility = self.futility_pruning and depth <= FUTILITY_MAX_DEPTH
+        use_razor = self.razoring and depth <= RAZOR_MAX_DEPTH
+        use_null = (self.null_move and allow_null and depth >= NULL_MOVE_MIN_DEPTH
+                    and self.has_non_pawn_material(board))
+        if not (use_futility or use_razor or use_null):
+            return None
+
+        static_eval = color * self.static_eval(board, state)
+
+        # Reverse futility: too far above beta for the last plies to matter
+        if use_futility and static_eval - FUTILITY_MARGIN * depth >= beta:
+            self.pruning_stats["futility_prunes"] += 1
+            return static_eval
+
+        # Razoring: hopelessly below alpha unless a capture sequence saves it
+        if use_razor and static_eval + RAZOR_MARGINS[depth] <= alpha:
+            if self.quiescence is not None:
+                score = self.quiescence.search(state, alpha, beta, color)
+            else:
+                score = static_eval
+            if score <= alpha:
+                self.pruning_stats["razor_prunes"] += 1
+                return score
+
+        # Null move: if passing still holds beta, a real move will too
+        if use_null and static_eval >= beta:
+            reduced_depth = max(0, depth - 1 - NULL_MOVE_REDUCTION)
+            state.push(chess.Move.null())
+            score = -self.idpvs(state, reduced_depth, -beta, -beta + 1, -color, allow_null=False)
+            state.pop()
+            if score >= beta:
+                # Deep down, double-check with a real (reduced) search against zugzwang
+                if depth >= NULL_MOVE_VERIFY_DEPTH:
+                    score = self.idpvs(state, reduced_depth, beta - 1, beta, color, allow_null=False)
+                    if score < beta:
+                        return None
+                self.pruning_stats["null_move_cutoffs"] += 1
+                return score
+
+        return None
+
+    @staticmethod
+    def has_non_pawn_material(board):
+        """
+        True if the side to move has anything besides pawns and the king.
+        """
+        us = board.occupied_co[board.turn]
+        return bool(us & ~(board.pawns | board.kings))
+
+    def idpvs_sequential(self, state, depth):
         """
         Runs IDPVS one depth at a time.
+        Each iteration starts with the previous best move and orders the other
+        root moves by their previous scores. From depth 2 on, the root is
+        searched in a narrow window around the previous score, widened and
+        re-searched whenever the result falls outside it.
+        If the limits run out mid-iteration, the previous iteration's move is
+        kept unless the unfinished one already found something better.
+        Returns (best move, score).
         """
+        board = state.board
         best_move = None
+        score = None
+        root_scores = {}
         color = 1 if board.turn == chess.WHITE else -1
+        root_ply = len(board.move_stack)
 
         for current_depth in range(1, depth + 1):
-            max_eval = float('-inf')
-            alpha, beta = float('-inf'), float('inf')
-            for move in self.order_moves(board):
-                board.push(move)
-                history.append(board.fen())
-                eval = -self.idpvs(board, current_depth - 1, -beta, -alpha, -color, history)
-                history.pop()
-                board.pop()
-
-                if eval > max_eval:
-                    max_eval = eval
-                    best_move = move
-
-                alpha = max(alpha, eval)
-                if alpha >= beta:
-                    break
+            if score is None:
+                delta = float('inf')
+                alpha, beta = float('-inf'), float('inf')
+            else:
+                delta = ASPIRATION_WINDOW
+                alpha, beta = score - delta, score + delta
+
+            try:
+                while True:
+                    moves = self.order_root_moves(board, best_move, root_scores)
+                    result, result_move, scores = self.search_root(
+                        state, current_depth, alpha, beta, color, moves
+                    )
+                    root_scores.update(scores)
+                    if result_move is None:
+                        return None, result
 
-        return best_move
+                    # Widen the side that failed and search again
+                    if result <= alpha:
+                        delta *= 4
+                        alpha = score - delta if delta < 1000 else float('-inf')
+                    elif result >= beta:
+                        best_move = result_move
+                        delta *= 4
+                        beta = score + delta if delta < 1000 else float('inf')
+                    else:
+                        break
+                    self.researches += 1
+            except SearchTimeout:
+                self.unwind(state, root_ply)
+                partial_score, partial_move = self.root_progress
+                if partial_move is not None:
+                    best_move, score = partial_move, partial_score
+                elif best_move is None:
+                    best_move = next(iter(self.move_orderer.order_moves(board)), None)
+                break
+
+            best_move, score = result_move, result
+            self.completed_depth = current_depth
+            if self.out_of_limits():
+                break
 
-    def idpvs_parallel(self, board, depth, history):
+        return best_move, score
+
+    def search_root(self, state, depth, alpha, beta, color, moves):
+        """
+        One PVS pass over the root moves in the given order.
+        Returns (best score, best move, {move: score}).
+        """
+        alpha_orig = alpha
+        max_eval = float('-inf')
+        best_move = None
+        scores = {}
+        # Best move that beat the window so far, kept in case the search times out
+        self.root_progress = (None, None)
+
+        for i, move in enumerate(moves):
+            state.push(move)
+            if i == 0:
+                eval = -self.idpvs(state, depth - 1, -beta, -alpha, -color)
+            else:
+                eval = -self.idpvs(state, depth - 1, -alpha - 1, -alpha, -color)
+                if alpha < eval < beta:
+                    eval = -self.idpvs(state, depth - 1, -beta, -alpha, -color)
+            state.pop()
+
+            scores[move] = eval
+            if eval > max_eval:
+                max_eval = eval
+                best_move = move
+                if eval > alpha_orig:
+                    self.root_progress = (eval, move)
+            alpha = max(alpha, eval)
+            if alpha >= beta:
+                break
+
+        if best_move is not None:
+            self.store(state, depth, max_eval, bound_flag(max_eval, alpha_orig, beta), best_move)
+        return max_eval, best_move, scores
+
+    def order_root_moves(self, board, best_move, root_scores):
+        """
+        Previous best move first, then moves by their last score.
+        Moves without a score yet keep the move orderer's order.
+        """
+        moves = self.move_orderer.order_moves(board, best_move)
+        if not root_scores:
+            return moves
+        rank = {move: i for i, move in enumerate(moves)}
+        return sorted(
+            moves,
+            key=lambda move: (move == best_move, root_scores.get(move, float('-inf')), -rank[move]),
+            reverse=True,
+        )
+
+    def principal_variation(self, board, best_move, max_length):
+        """
+        Follows the stored best moves through the transposition table.
+        """
+        if best_move is None:
+            return []
+        pv = [best_move]
+        if self.transposition_table is None:
+            return pv
+        board = board.copy(stack=False)
+        board.push(best_move)
+        seen = {position_key(board)}
+        while len(pv) < max_length:
+            entry = self.transposition_table.probe(position_key(board))
+            if entry is None or entry[3] is None or not board.is_legal(entry[3]):
+                break
+            board.push(entry[3])
+            key = position_key(board)
+            if key in seen:
+                break
+            seen.add(key)
+            pv.append(entry[3])
+        return pv
+
+    def idpvs_parallel(self, board, depth):
         """
         Uses multiple workers to speed up the search.
+        Workers come from the long-lived pool and get the position from
+        compact_board, so they see repetitions of earlier game positions.
+        Each iteration hands out the root moves ordered by the previous one,
+        all in the same aspiration window around the previous score. If the
+        best result falls outside it, that side is widened and only the moves
+        that can still matter are searched again.
+        An iteration cut short by the limits is thrown away. Workers count
+        their nodes into shared_nodes, so the node budget holds across them.
+        Returns (best move, score).
         """
         color = 1 if board.turn == chess.WHITE else -1
+        position = compact_board(board)
+        best_move = None
+        score = None
+        root_scores = {}
 
         for current_depth in range(1, depth + 1):
-            moves = list(self.order_moves(board))
-            worker_args = [
-                (board.copy(), move, current_depth, float('-inf'), float('inf'), color, history.copy())
-                for move in moves
-            ]
+            moves = self.order_root_moves(board, best_move, root_scores)
+            if not moves:
+                return None, float('-inf')
+            if score is None:
+                delta = float('inf')
+                alpha, beta = float('-inf'), float('inf')
+            else:
+                delta = ASPIRATION_WINDOW
+                alpha, beta = score - delta, score + delta
+
+            scores = {}
+            pending = moves
+            timed_out = False
+            while True:
+                # The node budget is shared through shared_nodes, so workers get the full limits
+                worker_args = [
+                    (position, move.uci(), current_depth, alpha, beta, color, self.limits) for move in pending
+                ]
+                for move_uci, eval, stats in self.map_workers("idpvs_parallel_worker", worker_args):
+                    self.add_worker_stats(stats)
+                    if eval is None:
+                        timed_out = True
+                    else:
+                        scores[chess.Move.from_uci(move_uci)] = eval
+                if timed_out:
+                    break
+
+                # Widen the side that failed; moves that failed low stay refuted when beta moves
+                result = max(scores.values())
+                if result >= beta:
+                    pending = [move for move in moves if scores[move] >= beta]
+                    delta *= 4
+                    beta = score + delta if delta < 1000 else float('inf')
+                elif result <= alpha:
+                    pending = moves
+                    delta *= 4
+                    alpha = score - delta if delta < 1000 else float('-inf')
+                else:
+                    break
+                self.researches += 1
 
-            with Pool(self.num_workers) as pool:
-                results = pool.map(self.idpvs_parallel_worker, worker_args)
+            if timed_out:
+                # Out of time: only trust a partial iteration if we have nothing else
+                if best_move is None and scores:
+                    best_move = max(scores, key=scores.get)
+                    score = scores[best_move]
+                elif best_move is None:
+                    best_move = moves[0]
+                break
 
-            best_move = max(results, key=lambda x: x[1])[0]
+            best_move = max(scores, key=scores.get)
+            score = scores[best_move]
+            root_scores = scores
+            self.completed_depth = current_depth
+            if self.out_of_limits():
+                break
 
-        return best_move
+        return best_move, score
 
     def idpvs_parallel_worker(self, args):
         """
         Worker function for parallel search.
+        Returns (move, eval, counters); eval is None if the time ran out.
         """
-        board, move, depth, alpha, beta, color, history = args
-        board.push(move)
-        history.append(board.fen())
-        eval = -self.idpvs(board, depth - 1, -beta, -alpha, -color, history)
-        history.pop()
-        board.pop()
-        return move, eval
-
-    def order_moves(self, board):
-        """
-        Sort moves to try promising ones first.
-        """
-        def move_score(move):
-            score = 0
-            if board.is_capture(move):
-                captured_piece = board.piece_at(move.to_square)
-                score += 10 + (captured_piece.piece_type if captured_piece else 0)
-            if move.promotion:
-                score += 20
-            if board.gives_check(move):
-                score += 5
-            return score
-
-        return sorted(board.legal_moves, key=move_score, reverse=True)
+        position, move_uci, depth, alpha, beta, color, limits = args
+        state = self.worker_state(position, move_uci, limits)
+        try:
+            eval = -self.idpvs(state, depth - 1, -beta, -alpha, -color)
+        except SearchTimeout:
+            eval = None
+        return move_uci, eval, self.worker_stats()
@@ -1,211 +1,656 @@
+import queue
+import threading
+import time
+from collections import Counter
 import chess
-import torch
-import math
 import numpy as np
 
 from ai.algorithms.base import AIAlgorithm
-from ai.neural_network.policy_value_net import PolicyValueNet
-from ai.neural_network.utils import board_to_feature_vector, move_to_index
-from ai.evaluation.policy_value_evaluation import evaluate_board_with_policy_value
-
-DEVICE = torch.device("mps") if torch.backends.mps.is_available() else torch.device("cpu")
-MODEL_PATH = "model/policy_value_model.pt"
+from ai.search import (
+    SearchLimits, MCTSTree, NODE_BYTES, EvalCache, EVAL_CACHE_SIZE, position_key, compact_board, restore_board
+)
+from ai.search.mcts_tree import UNEXPANDED, EXPANDED, DRAWN, LOST
+from ai.search.transposition_table import encode_move
+from ai.neural_network.utils import moves_to_indices
+from ai.evaluation.policy_value_evaluation import evaluate_boards_with_policy_value
+from ai.neural_network.model_registry import get_model, DEFAULT_PATHS
+
+MODEL_PATH = DEFAULT_PATHS["policy_value"]
 C_PUCT = 1.0
 NUM_SIMULATIONS = 800
+MAX_SIMULATIONS = 10 ** 9
 TEMPERATURE = 1e-3
+# Leaves evaluated per forward pass (1 = one simulation at a time)
+BATCH_SIZE = 8
+# Pretend-loss added to every node on a pending path, in value units ([-1, 1])
+VIRTUAL_LOSS = 1.0
+# Memory budget for the tree arrays; the search stops when it's full
+TREE_MEMORY_MB = 256
+# Extra simulations (as a fraction of num_simulations) granted once when the
+# top two root moves are still close at the end; 0 = never extend
+EXTENSION = 0.0
+# "Close": the runner-up has at least this share of the best move's visits
+CLOSE_VISIT_RATIO = 0.8
+# How parallel=True splits the work: "root" (independent trees in worker
+# processes, merged into the main tree) or "tree" (threads sharing one tree)
+PARALLEL_MODE = "root"
+# Root prior noise that keeps root-parallel workers from building the same tree
+DIRICHLET_ALPHA = 0.3
+DIRICHLET_EPSILON = 0.25
+
+
+def sample_move(moves, visits, temperature=TEMPERATURE):
+    """
+    Chooses a move based on visit counts.
+    """
+    visits = np.asarray(visits, dtype=np.float32)
 
-class MCTSNode:
-    def __init__(self, board, parent=None, move=None, prior=0.0):
-        self.board = board
-        self.parent = parent
-        self.move = move
-        self.children = {}
-        self.visits = 0
-        self.value_sum = 0.0
-        self.prior = prior
-
-    def expanded(self):
-        return len(self.children) > 0
-
-    def value(self):
-        if self.visits == 0:
-            return 0.0
-        return self.value_sum / self.visits
-
-    def select_child(self):
-        best_score = -float('inf')
-        parent_visits = max(1, self.visits)
-        best_child = None
-        for child in self.children.values():
-            q = child.value()
-            u = C_PUCT * child.prior * math.sqrt(parent_visits) / (1 + child.visits)
-            score = q + u
-            if score > best_score:
-                best_score = score
-                best_child = child
-        return best_child
-
-    def expand(self, action_priors):
-        for move, prob in action_priors:
-            new_board = self.board.copy()
-            new_board.push(move)
-            self.children[move] = MCTSNode(new_board, parent=self, move=move, prior=prob)
-
-    def update(self, leaf_value):
-        self.visits += 1
-        self.value_sum += leaf_value
-
-    def update_recursive(self, leaf_value):
-        self.update(leaf_value)
-        if self.parent:
-            self.parent.update_recursive(-leaf_value)
+    # Prevent too-small temperature from causing overflow
+    effective_temp = max(temperature, 1e-3)
+    max_visits = 1e9
+    visits_clipped = np.clip(visits, 1, max_visits)
 
-class MCTS:
-    def __init__(self, board, model, num_simulations=NUM_SIMULATIONS):
-        self.root = MCTSNode(board)
-        self.model = model
-        self.num_simulations = num_simulations
+    # Use logs to avoid overflow
+    log_visits = np.log(visits_clipped)
+    max_log = np.max(log_visits)
 
-    def run(self):
-        """
-        Runs MCTS simulations from the root.
-        """
-        for _ in range(self.num_simulations):
-            node = self.root
-            # Selection
-            while node.expanded():
-                node = node.select_child()
+    # Compute exponents in a stable manner
+    scaled_logs = (1/effective_temp) * (log_visits - max_log)
+    probs = np.exp(scaled_logs)
+
+    total = np.sum(probs)
+
+    # Check for invalid probabilities
+    if not np.isfinite(total) or total == 0:
+        # fallback: choose move with max visits
+        return moves[np.argmax(visits)]
 
-            # Evaluate leaf
-            leaf_value = self.evaluate_leaf(node)
+    probs = probs / total
+    if np.any(np.isnan(probs)):
+        # fallback: choose move with max visits
+        return moves[np.argmax(visits)]
 
-            # Expand if not terminal
-            if not node.board.is_game_over():
-                action_priors = self.get_action_priors(node.board)
-                if action_priors:
-                    node.expand(action_priors)
+    return moves[np.random.choice(len(moves), p=probs)]
 
-            # Backpropagation
-            node.update_recursive(-leaf_value)
 
-    def evaluate_leaf(self, node):
+class MCTS:
+    """
+    Policy-guided MCTS on an array-backed MCTSTree.
+    Only the root board is kept; a board is copied only for evaluated leaves.
+    With a cache, network results are looked up by Zobrist key first.
+    """
+
+    def __init__(self, board, model, num_simulations=NUM_SIMULATIONS, batch_size=BATCH_SIZE,
+                 virtual_loss=VIRTUAL_LOSS, memory_mb=TREE_MEMORY_MB, early_stop=True, extension=EXTENSION,
+                 cache=None):
+        self.board = board.copy()
+        self.max_nodes = int(memory_mb * 2 ** 20) // NODE_BYTES
+        self.tree = MCTSTree(max_nodes=self.max_nodes)
+        self.model = model
+        self.cache = cache
+        self.num_simulations = num_simulations
+        self.batch_size = batch_size
+        self.virtual_loss = virtual_loss
+        self.early_stop = early_stop
+        self.extension = extension
+        self.simulations = 0
+        self.boards_built = 0
+        self.simulations_saved = 0
+        self.extended_simulations = 0
+        # Optional np.random.Generator for Dirichlet noise on the root priors
+        self.root_noise = None
+
+    def run(self, limits=None):
+        """
+        Runs simulations from the root, batch_size leaves per forward pass,
+        until num_simulations, the (started) limits or the tree's memory run
+        out, or early_stop sees the move can't change. At least one runs.
+        """
+        tree = self.tree
+        start = time.time()
+        target = self.num_simulations
+        simulations = 0
+        while True:
+            stop, target = self.search_over(simulations, target, start, limits)
+            if stop:
+                break
+            budget = min(self.batch_size, target - simulations)
+            leaves, boards, paths, keys = [], [], [], []
+            # Terminal and cached leaves count against the batch too, so the
+            # limits are still checked when no leaf needs the network
+            for _ in range(budget):
+                path, board = self.select_leaf(leaves)
+                leaf = path[-1]
+                if leaf in leaves:
+                    # The virtual loss didn't steer away; evaluate what we have
+                    break
+                if board is None:
+                    tree.backup(path, self.terminal_value(tree.state[leaf]))
+                    simulations += 1
+                    continue
+                key, cached_value = self.expand_from_cache(leaf, board)
+                if cached_value is not None:
+                    tree.backup(path, cached_value)
+                    simulations += 1
+                    continue
+                self.add_virtual_loss(path)
+                leaves.append(leaf)
+                boards.append(board)
+                paths.append(path)
+                keys.append(key)
+
+            if not leaves:
+                continue
+            for path, leaf_value in zip(paths, self.evaluate_leaves(leaves, boards, keys)):
+                # Takes the virtual loss back off in the same step
+                tree.backup(path, leaf_value, self.virtual_loss)
+            simulations += len(leaves)
+        self.simulations += simulations
+
+    def run_threaded(self, limits=None, num_threads=2):
         """
-        Evaluates a position at the leaf node.
+        Tree parallelization: num_threads threads share this tree and one
+        inference thread batches their leaves. An error in any thread stops
+        the search and is raised here.
+        """
+        tree = self.tree
+        lock = threading.Lock()
+        requests = queue.Queue()
+        start = time.time()
+        target = self.num_simulations
+        claimed = 0
+        stopped = False
+        errors = []
+
+        def claim():
+            nonlocal claimed, target, stopped
+            with lock:
+                if errors or stopped:
+                    return False
+                # Pending paths already count their visit, so early_stop sees every claimed simulation
+                stopped, target = self.search_over(claimed, target, start, limits)
+                if stopped:
+                    return False
+                claimed += 1
+                return True
+
+        def search_thread():
+            board = self.board.copy()
+            reply = queue.Queue(maxsize=1)
+            try:
+                while claim():
+                    with lock:
+                        path, leaf_board = self.select_leaf(board=board)
+                        leaf = path[-1]
+                        if leaf_board is None:
+                            tree.backup(path, self.terminal_value(tree.state[leaf]))
+                            continue
+                        key, cached_value = self.expand_from_cache(leaf, leaf_board)
+                        if cached_value is not None:
+                            tree.backup(path, cached_value)
+                            continue
+                        self.add_virtual_loss(path)
+                    requests.put((leaf_board, reply))
+                    result = reply.get()
+                    if isinstance(result, Exception):
+                        raise result
+                    probs, val_cp = result
+                    with lock:
+                        leaf_value = self.expand_leaf(leaf, leaf_board, probs, val_cp, key)
+                        tree.backup(path, leaf_value, self.virtual_loss)
+            except Exception as error:
+                errors.append(error)
+
+        def inference_thread():
+            finished = False
+            while not finished:
+                batch = [requests.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(requests.get_nowait())
+                    except queue.Empty:
+                        break
+                if None in batch:
+                    finished = True
+                    batch = [item for item in batch if item is not None]
+                if not batch:
+                    continue
+                try:
+                    policy_probs, values_cp = evaluate_boards_with_policy_value(
+                        [leaf_board for leaf_board, _ in batch], self.model
+                    )
+                except Exception as error:
+                    # Every waiting search thread gets the error instead of an answer
+                    for _, reply in batch:
+                        reply.put(error)
+                    continue
+                for (_, reply), probs, val_cp in zip(batch, policy_probs, values_cp):
+                    reply.put((probs, val_cp))
+
+        inference = threading.Thread(target=inference_thread, daemon=True)
+        inference.start()
+        searchers = [threading.Thread(target=search_thread, daemon=True) for _ in range(num_threads)]
+        for thread in searchers:
+            thread.start()
+        for thread in searchers:
+            thread.join()
+        requests.put(None)
+        inference.join()
+        self.simulations += claimed
+        if errors:
+            raise errors[0]
+
+    def search_over(self, simulations, target, start, limits):
         """
-        board = node.board
-        if board.is_game_over():
-            result = board.result()
-            if result == "1-0":
-                return 1.0
-            elif result == "0-1":
-                return -1.0
+        Whether to stop before the next simulation, shared by run and
+        run_threaded: the target is reached (extended once if the top moves
+        are close), the limits or the tree's memory ran out, or early_stop
+        sees the move can't change. Returns (stop, possibly extended target).
+        """
+        if simulations >= target:
+            if self.extended_simulations or not self.extension or not self.top_moves_close():
+                return True, target
+            self.extended_simulations = max(1, int(self.extension * self.num_simulations))
+            target += self.extended_simulations
+        if simulations > 0 and limits is not None and limits.should_stop(simulations):
+            return True, target
+        if simulations > 0 and self.tree.full():
+            return True, target
+        if self.early_stop and simulations > 0:
+            remaining = self.remaining_simulations(target - simulations, simulations, start, limits)
+            if self.move_decided(remaining):
+                self.simulations_saved += int(remaining)
+                return True, target
+        return False, target
+
+    def remaining_simulations(self, remaining, simulations, start, limits):
+        """
+        How many more simulations the search can run: what's left of the
+        budget, or fewer if they won't fit before the time limit.
+        """
+        if limits is not None and limits.stop_time is not None:
+            now = time.time()
+            rate = simulations / max(now - start, 1e-6)
+            remaining = min(remaining, max(0.0, rate * (limits.stop_time - now)))
+        return remaining
+
+    def root_visits(self):
+        tree = self.tree
+        first = int(tree.first_child[tree.root])
+        return tree.visits[first:first + int(tree.num_children[tree.root])]
+
+    def move_decided(self, remaining):
+        """
+        True once the most visited root move stays ahead even if every
+        remaining simulation went to the runner-up (or it's the only move).
+        """
+        if not self.tree.expanded(self.tree.root):
+            return False
+        visits = self.root_visits()
+        if len(visits) == 1:
+            return True
+        runner_up, best = np.partition(visits, -2)[-2:]
+        return best - runner_up > remaining
+
+    def top_moves_close(self):
+        """
+        True if the runner-up has nearly as many visits as the best move.
+        """
+        if not self.tree.expanded(self.tree.root):
+            return False
+        visits = self.root_visits()
+        if len(visits) < 2:
+            return False
+        runner_up, best = np.partition(visits, -2)[-2:]
+        return runner_up >= CLOSE_VISIT_RATIO * best
+
+    def select_leaf(self, pending=(), board=None):
+        """
+        Walks down from the root by PUCT, replaying the moves on the root
+        board (or the given copy of it).
+        Returns (path of node indices, board at the leaf). The board is None
+        for finished games and for leaves already in pending.
+        """
+        tree = self.tree
+        board = board if board is not None else self.board
+        state = tree.state
+        node = tree.root
+        path = [node]
+        while state[node] == EXPANDED:
+            node = tree.select_child(node, C_PUCT)
+            board.push(tree.get_move(node))
+            path.append(node)
+
+        leaf_board = None
+        if tree.state[node] == UNEXPANDED and node not in pending:
+            if board.is_game_over():
+                tree.state[node] = LOST if board.is_checkmate() else DRAWN
             else:
-                return 0.0
-        val_cp = evaluate_board_with_policy_value(board)
-        leaf_value = max(min(val_cp / 1000.0, 1.0), -1.0)
-        return leaf_value
+                leaf_board = board.copy(stack=False)
+                self.boards_built += 1
+        for _ in range(len(path) - 1):
+            board.pop()
+        return path, leaf_board
+
+    @staticmethod
+    def terminal_value(state):
+        """
+        Value of a finished game from the side to move's view.
+        """
+        return -1.0 if state == LOST else 0.0
 
-    def get_action_priors(self, board):
+    def add_virtual_loss(self, path):
         """
-        Gets move probabilities from the neural network policy.
+        Counts a pending visit as a loss on the whole path, so other
+        selections in the same batch prefer different lines.
         """
-        if board.is_game_over():
-            return []
+        self.tree.visits[path] += 1
+        self.tree.value_sum[path] -= self.virtual_loss
 
-        fv = board_to_feature_vector(board)
-        input_tensor = torch.tensor(fv, dtype=torch.float32).unsqueeze(0).to(DEVICE)
-        self.model.eval()
-        with torch.no_grad():
-            policy_logits, value = self.model(input_tensor)
-            policy_probs = torch.softmax(policy_logits, dim=1).cpu().numpy()[0]
+    def evaluate_leaves(self, leaves, boards, keys=None):
+        """
+        Expands non-terminal leaves and returns their values from the side
+        to move's view. Policy priors and values for all of them come from
+        a single forward pass.
+        """
+        keys = keys or [None] * len(leaves)
+        policy_probs, values_cp = evaluate_boards_with_policy_value(boards, self.model)
+        return [
+            self.expand_leaf(leaf, board, probs, val_cp, key)
+            for leaf, board, probs, val_cp, key in zip(leaves, boards, policy_probs, values_cp, keys)
+        ]
+
+    def expand_leaf(self, leaf, board, policy_probs, val_cp, key=None):
+        """
+        Adds the leaf's children from the policy (unless another thread got
+        there first) and returns its value from the side to move's view.
+        With a key, the result also goes into the cache.
+        """
+        moves, priors = self.priors_from_policy(board, policy_probs)
+        # The evaluator scores from White's view
+        value = max(min(val_cp / 1000.0, 1.0), -1.0)
+        value = value if board.turn == chess.WHITE else -value
+        if key is not None:
+            self.cache.put(key, (moves, priors, value))
+        self.add_children(leaf, moves, priors)
+        return value
+
+    def expand_from_cache(self, leaf, board):
+        """
+        Looks the leaf's position up in the cache. On a hit the leaf is
+        expanded from the stored priors and its value is returned.
+        Returns (key to store the network's result under, value or None).
+        """
+        if self.cache is None:
+            return None, None
+        key = position_key(board)
+        entry = self.cache.get(key)
+        if entry is None:
+            return key, None
+        moves, priors, value = entry
+        self.add_children(leaf, moves, priors)
+        return key, value
+
+    def add_children(self, leaf, moves, priors):
+        """
+        Expands the leaf, unless it has been already or has no moves.
+        """
+        tree = self.tree
+        if tree.state[leaf] == UNEXPANDED and len(moves):
+            tree.add_encoded_children(leaf, moves, priors)
+            if leaf == tree.root and self.root_noise is not None:
+                self.add_root_noise()
 
+    def add_root_noise(self):
+        """
+        Mixes Dirichlet noise into the root priors.
+        """
+        tree = self.tree
+        children = tree.children(tree.root)
+        block = slice(children.start, children.stop)
+        noise = self.root_noise.dirichlet([DIRICHLET_ALPHA] * len(children))
+        tree.prior[block] = (1 - DIRICHLET_EPSILON) * tree.prior[block] + DIRICHLET_EPSILON * noise
+
+    @staticmethod
+    def priors_from_policy(board, policy_probs):
+        """
+        Picks the legal moves out of a policy vector and renormalizes them.
+        Returns the moves (packed) and their priors as arrays.
+        """
         legal_moves = list(board.legal_moves)
-        action_priors = []
-        for move in legal_moves:
-            try:
-                idx = move_to_index(move, board)
-                prob = float(policy_probs[idx])
-            except:
-                # If indexing fails, assign a small probability
-                prob = 1e-9
-            action_priors.append((move, prob))
-
-        total_prob = sum(p for _, p in action_priors)
+        indices = moves_to_indices(board, legal_moves)
+        # Moves the policy has no index for get a small probability
+        priors = np.where(indices >= 0, policy_probs[indices], 1e-9).astype(np.float32)
+        total_prob = priors.sum()
         if total_prob > 0:
-            action_priors = [(m, p / total_prob) for m, p in action_priors]
-
-        return action_priors
+            priors /= total_prob
+        moves = np.array([encode_move(move) for move in legal_moves], dtype=np.uint16)
+        return moves, priors
 
     def choose_move(self, temperature=TEMPERATURE):
         """
         Chooses a move based on visit counts.
         """
-        if len(self.root.children) == 0:
+        counts = self.root_visit_counts()
+        if not counts:
             return None
+        moves, visits = zip(*counts)
+        return sample_move(moves, visits, temperature)
 
-        visit_counts = [(child.visits, child.move) for child in self.root.children.values()]
-        visits, moves = zip(*visit_counts)
-        visits = np.array(visits, dtype=np.float32)
-
-        # Prevent too-small temperature from causing overflow
-        effective_temp = max(temperature, 1e-3)
-        max_visits = 1e9
-        visits_clipped = np.clip(visits, 1, max_visits)
-
-        # Use logs to avoid overflow
-        log_visits = np.log(visits_clipped)
-        max_log = np.max(log_visits)
-
-        # Compute exponents in a stable manner
-        scaled_logs = (1/effective_temp) * (log_visits - max_log)
-        probs = np.exp(scaled_logs)
-
-        total = np.sum(probs)
-
-        # Check for invalid probabilities
-        if not np.isfinite(total) or total == 0:
-            # fallback: choose move with max visits
-            return moves[np.argmax(visits)]
-
-        probs = probs / total
-        if np.any(np.isnan(probs)):
-            # fallback: choose move with max visits
-            return moves[np.argmax(visits)]
-
-        return np.random.choice(moves, p=probs)
+    def root_visit_counts(self):
+        """
+        (move, visits) for every root child.
+        """
+        tree = self.tree
+        return [(tree.get_move(child), int(tree.visits[child])) for child in tree.children(tree.root)]
 
     def update_root(self, move):
         """
-        Moves the root forward after a chosen move.
+        Moves the root forward after a move, keeping the subtree below it
+        (or starting over if the move was never expanded).
         """
-        if move in self.root.children:
-            self.root = self.root.children[move]
-            self.root.parent = None
+        child = self.tree.find_child(self.tree.root, move)
+        self.board.push(move)
+        if child is not None:
+            self.tree = self.tree.extract(child)
         else:
-            new_board = self.root.board.copy()
-            new_board.push(move)
-            self.root = MCTSNode(new_board)
+            self.tree = MCTSTree(max_nodes=self.max_nodes)
+
+    def new_search(self):
+        """
+        Resets the per-search counters; the tree itself is kept.
+        """
+        self.simulations = 0
+        self.boards_built = 0
+        self.simulations_saved = 0
+        self.extended_simulations = 0
+        if self.cache is not None:
+            self.cache.reset_stats()
+
+    def stats(self):
+        """
+        Simulation count and how much memory the tree takes.
+        """
+        usage = self.tree.memory_usage()
+        cache_stats = self.cache.stats() if self.cache is not None else {}
+        return {
+            "simulations": self.simulations,
+            **usage,
+            "tree_mb": usage["tree_bytes"] / 2 ** 20,
+            "boards_built": self.boards_built,
+            "simulations_saved": self.simulations_saved,
+            "extended_simulations": self.extended_simulations,
+            **cache_stats,
+        }
 
 def load_model(path=MODEL_PATH):
     """
-    Loads the policy-value network.
+    The policy-value network from the model registry: loaded on first use
+    and shared with the evaluator, so there is only ever one copy of it in
+    memory.
     """
-    input_dim = 839     # Must match training
-    policy_size = 5760  # Must match training
-    hidden_dim = 256
-    model = PolicyValueNet(input_dim, policy_size, hidden_dim)
-    model.load_state_dict(torch.load(path, map_location=DEVICE))
-    model.to(DEVICE)
-    model.eval()
-    return model
+    return get_model("policy_value", path)
 
 class MCTSPolicyGuided(AIAlgorithm):
-    def __init__(self, num_simulations=NUM_SIMULATIONS, parallel=False):
-        super().__init__(parallel=parallel)
+    """
+    Policy-guided MCTS.
+    Leaves are evaluated batch_size at a time (with virtual_loss), the tree
+    stays within memory_mb and, with reuse_tree, is kept between moves.
+    parallel_mode is "root" (worker processes search copies of the tree,
+    merged back into it) or "tree" (threads sharing one tree); both reuse.
+    early_stop and extension stop or extend the search once the move is
+    decided or close; cache_size network results are kept.
+    """
+
+    def __init__(self, num_simulations=NUM_SIMULATIONS, parallel=False, batch_size=BATCH_SIZE,
+                 virtual_loss=VIRTUAL_LOSS, memory_mb=TREE_MEMORY_MB, reuse_tree=True,
+                 num_workers=None, parallel_mode=PARALLEL_MODE, early_stop=True, extension=EXTENSION,
+                 cache_size=EVAL_CACHE_SIZE):
+        super().__init__(parallel=parallel, num_workers=num_workers)
+        if parallel_mode not in ("root", "tree"):
+            raise ValueError(f"Unknown parallel_mode: {parallel_mode}")
+        self.parallel_mode = parallel_mode
         self.model = load_model()
         self.num_simulations = num_simulations
+        self.batch_size = batch_size
+        self.virtual_loss = virtual_loss
+        self.memory_mb = memory_mb
+        self.reuse_tree = reuse_tree
+        self.early_stop = early_stop
+        self.extension = extension
+        self.cache_size = cache_size
+        self.eval_cache = EvalCache(cache_size) if cache_size else None
+        self.mcts = None
+        # Game moves up to and including our last move, i.e. where the tree is
+        self.tree_moves = []
+        self.search_stats = {}
+
+    def get_best_move(self, board: chess.Board, history: list = None, depth: int = None,
+                      limits: SearchLimits = None) -> chess.Move:
+        # Simulations are expensive, so check the clock on every one
+        _, limits = self.prepare_limits(depth, limits, check_interval=1)
+        num_simulations = self.num_simulations
+        if limits.is_bounded():
+            # The limits decide: a node budget counts simulations, otherwise run until time is up
+            num_simulations = limits.nodes or MAX_SIMULATIONS
+        root_parallel = self.parallel and self.num_workers > 1 and self.parallel_mode == "root"
+        threads = self.num_workers if self.parallel and self.parallel_mode == "tree" else 1
+        moves = self.game_moves(board, history)
+        if self.reuse_tree and self.advance_tree(board, moves):
+            mcts = self.mcts
+            inherited_visits = int(mcts.tree.visits[mcts.tree.root])
+        else:
+            mcts = MCTS(board, self.model, batch_size=self.batch_size, virtual_loss=self.virtual_loss,
+                        memory_mb=self.memory_mb, early_stop=self.early_stop, extension=self.extension,
+                        cache=self.eval_cache)
+            inherited_visits = 0
+        mcts.num_simulations = num_simulations
+        mcts.new_search()
+        if root_parallel:
+            stats = self.root_parallel_search(mcts, num_simulations, limits)
+        else:
+            if threads > 1:
+                mcts.run_threaded(limits, threads)
+            else:
+                mcts.run(limits)
+            stats = mcts.stats()
+        best_move = mcts.choose_move()
+        self.search_stats = {**stats, "inherited_visits": inherited_visits, "time": limits.elapsed()}
+
+        if self.reuse_tree and best_move is not None:
+            mcts.update_root(best_move)
+            self.mcts = mcts
+            self.tree_moves = moves + [best_move]
+        else:
+            self.mcts = None
+        return best_move
 
-    def get_best_move(self, board: chess.Board, history: list = None, depth: int = None) -> chess.Move:
-        mcts = MCTS(board, self.model, num_simulations=self.num_simulations)
-        mcts.run()
-        return mcts.choose_move()
\ No newline at end of file
+    def root_parallel_search(self, mcts, num_simulations, limits):
+        """
+        Root parallelization: every worker searches its own copy of the
+        tree for a share of the simulations, then what each one added is
+        merged back into mcts.tree, so the move is chosen from the sum and
+        the tree can be reused like a single-process one.
+        Returns the workers' summed stats.
+        """
+        share, extra = divmod(num_simulations, self.num_workers)
+        seeds = np.random.SeedSequence().spawn(self.num_workers)
+        position = compact_board(mcts.board)
+        tree = mcts.tree
+        tasks = [
+            (position, tree, share + (1 if i < extra else 0), seeds[i] if i > 0 else None, limits.without_nodes())
+            for i in range(self.num_workers)
+        ]
+        base_visits = tree.visits[:tree.size].copy()
+        base_values = tree.value_sum[:tree.size].copy()
+        stats = Counter()
+        for worker_tree, worker_stats in self.map_workers("mcts_root_worker", tasks):
+            tree.merge(worker_tree, base_visits, base_values)
+            stats.update(worker_stats)
+        mcts.simulations = stats["simulations"]
+        if "cache_hits" in stats:
+            lookups = stats["cache_hits"] + stats["cache_misses"]
+            stats["cache_hit_rate"] = stats["cache_hits"] / lookups if lookups else 0.0
+        usage = tree.memory_usage()
+        return {**stats, **usage, "tree_mb": usage["tree_bytes"] / 2 ** 20, "workers": self.num_workers}
+
+    def mcts_root_worker(self, task):
+        """
+        One independent search in a worker process on a copy of the main
+        tree, with root noise for all but the first worker. Returns the
+        searched tree and stats.
+        """
+        position, tree, num_simulations, seed, limits = task
+        mcts = MCTS(restore_board(*position), self.model, num_simulations=num_simulations, batch_size=self.batch_size,
+                    virtual_loss=self.virtual_loss, memory_mb=self.memory_mb, early_stop=False,
+                    extension=self.extension, cache=self.eval_cache)
+        mcts.tree = tree
+        if seed is not None:
+            mcts.root_noise = np.random.default_rng(seed)
+            if tree.expanded(tree.root):
+                mcts.add_root_noise()
+        mcts.run(limits)
+        stats = mcts.stats()
+        for name in ("tree_mb", "nodes", "capacity", "tree_bytes"):
+            stats.pop(name)
+        return mcts.tree, stats
+
+    def __getstate__(self):
+        # Workers reload the model and start with no tree or cache of their own
+        state = super().__getstate__()
+        state.pop("model", None)
+        state.pop("eval_cache", None)
+        state["mcts"] = None
+        state["tree_moves"] = []
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.model = load_model()
+        self.eval_cache = EvalCache(self.cache_size) if self.cache_size else None
+
+    @staticmethod
+    def game_moves(board, history):
+        """
+        Moves played so far: the board's own move stack, or the history
+        list of moves if the board was set up without one.
+        """
+        if board.move_stack or not history:
+            return list(board.move_stack)
+        return [move for move in history if isinstance(move, chess.Move)]
+
+    def advance_tree(self, board, moves):
+        """
+        Moves the kept tree through the moves played since our last search.
+        Returns False (start a fresh tree) if it doesn't belong to this game.
+        """
+        if self.mcts is None:
+            return False
+        played = len(self.tree_moves)
+        if len(moves) < played or moves[:played] != self.tree_moves:
+            return False
+        for move in moves[played:]:
+            if not self.mcts.board.is_legal(move):
+                return False
+            self.mcts.update_root(move)
+        return self.mcts.board.fen() == board.fen()
\ No newline at end of file
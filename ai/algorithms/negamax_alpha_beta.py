@@ -1,88 +1,192 @@
-from multiprocessing import Pool
+from multiprocessing import RawValue
 import chess
-from ai.algorithms.base import AIAlgorithm
-from ai.evaluation.simple_net_evaluation import evaluate_board_with_simple_net
+from ai.algorithms.alpha_beta import AlphaBetaSearch
+from ai.search import LEAF_BATCH_SIZE, SearchLimits, SearchTimeout, bound_flag, compact_board
 
+# Nodes a worker searches between checks of whether its root move is already refuted
+REFUTATION_CHECK_INTERVAL = 64
 
-class NegamaxAlphaBeta(AIAlgorithm):
+
+class RootMoveRefuted(Exception):
+    """
+    Raised inside a worker once a sibling's score has refuted its root move.
+    """
+
+
+class NegamaxAlphaBeta(AlphaBetaSearch):
     """
     Negamax with alpha-beta pruning and optional parallelization.
+    Parallel mode follows Young Brothers Wait: the first root move is searched
+    on its own to get a bound, then its siblings go to the workers, which all
+    see the best root score found so far. A worker whose root move can no
+    longer beat that score gives up, however deep its search is.
+    With time or node limits it deepens one ply at a time until they run out.
+    Positions are scored incrementally (incremental_eval); without it, the
+    children of depth-1 nodes are scored leaf_batch_size at a time in one
+    forward pass (0 evaluates every leaf on its own).
     """
 
-    def __init__(self, depth=3, parallel=False):
-        super().__init__(parallel=parallel)
-        self.depth = depth
+    def __init__(self, depth=3, parallel=False, tt_size_mb=16, num_workers=None, quiescence=True,
+                 leaf_batch_size=LEAF_BATCH_SIZE, incremental_eval=True):
+        # Same table size as IDPVS; tt_size_mb=None searches without a table
+        super().__init__(depth=depth, parallel=parallel, num_workers=num_workers, tt_size_mb=tt_size_mb,
+                         quiescence=quiescence, leaf_batch_size=leaf_batch_size, incremental_eval=incremental_eval)
+        # Best root score so far; written by the main process, read by workers
+        self.shared_alpha = RawValue('d', float('-inf')) if self.num_workers > 1 else None
+        # In a worker: the best score found so far for the opponent's reply to
+        # its root move (None outside workers), and root moves given up on
+        self.reply_floor = None
+        self.refuted_moves = 0
 
-    def get_best_move(self, board: chess.Board, history: list = None, depth: int = None) -> chess.Move:
+    def get_best_move(self, board: chess.Board, history: list = None, depth: int = None,
+                      limits: SearchLimits = None) -> chess.Move:
         """
         Returns the best move found by negamax search.
         Uses parallel search if enabled and multiple workers are available.
+        Without time or node limits this is a single search to the given depth;
+        with them, it deepens iteratively and returns the last finished result
+        (or a better move from the unfinished iteration).
+        Repetitions are detected from the board's own move stack, so history
+        is only kept for API compatibility.
         """
-        depth = depth or self.depth
+        depth, self.limits = self.prepare_limits(depth, limits)
+        state = self.new_state(board)
+        self.new_search()
         if self.parallel and self.num_workers > 1:
-            return self.negamax_parallel(board, depth, history)
+            search_root = self.negamax_parallel
+        else:
+            search_root = self.negamax_sequential
+
+        if not self.limits.is_bounded():
+            best_move = search_root(state, depth)
+            completed_depth = depth
         else:
-            return self.negamax_sequential(board, depth, history)
+            best_move = None
+            completed_depth = 0
+            root_ply = len(board.move_stack)
+            for current_depth in range(1, depth + 1):
+                try:
+                    best_move = search_root(state, current_depth, best_move)
+                except SearchTimeout:
+                    self.unwind(state, root_ply)
+                    if self.root_progress is not None:
+                        best_move = self.root_progress
+                    elif best_move is None:
+                        best_move = next(iter(self.move_orderer.order_moves(board)), None)
+                    break
+                completed_depth = current_depth
+                if self.out_of_limits():
+                    break
+
+        self.search_stats = {
+            "depth": completed_depth,
+            "time": self.limits.elapsed(),
+            **self.stats(),
+        }
+        return best_move
+
+    def count_node(self):
+        super().count_node()
+        if (self.reply_floor is not None and self.nodes % REFUTATION_CHECK_INTERVAL == 0
+                and self.reply_floor >= -self.shared_alpha.value):
+            raise RootMoveRefuted
+
+    def reset_stats(self):
+        super().reset_stats()
+        self.refuted_moves = 0
+
+    def worker_stats(self):
+        return {**super().worker_stats(), "refuted_moves": self.refuted_moves}
+
+    def add_worker_stats(self, stats):
+        super().add_worker_stats(stats)
+        self.refuted_moves += stats["refuted_moves"]
+
+    def stats(self):
+        stats = super().stats()
+        if self.parallel and self.num_workers > 1:
+            stats["refuted_moves"] = self.refuted_moves
+        return stats
 
-    def negamax(self, board, depth, alpha, beta, color, history):
+    def negamax(self, state, depth, alpha, beta, color, poll_alpha=False, static_eval=None):
         """
         Negamax with alpha-beta pruning.
         Returns the best evaluation score for the current position.
+        With poll_alpha (a worker's reply node), the window is narrowed by the
+        shared root score before every move, and the best reply so far is
+        published in reply_floor so count_node can abort deeper searches
+        once the root move is refuted.
+        static_eval (White's view) is passed to leaves already scored in a batch.
         """
-        if depth == 0 or board.is_game_over():
-            return color * evaluate_board_with_simple_net(board, history)
+        self.count_node()
+        # Repetitions and 50-move draws depend on the path, so don't cache them
+        if state.is_draw():
+            return 0
+        board = state.board
+        alpha_orig = alpha
+
+        cutoff, alpha, beta, hash_move = self.probe(state, depth, alpha, beta)
+        if cutoff is not None:
+            return cutoff
+
+        game_over = not any(board.generate_legal_moves())
+        if depth == 0 or game_over:
+            return self.evaluate_leaf(state, depth, alpha, beta, color, alpha_orig, game_over, static_eval)
 
         max_eval = float('-inf')
+        best_move = None
 
-        for move in self.order_moves(board):
-            if move.promotion:
-                # Try all promotion types
-                for promotion_piece in [chess.QUEEN, chess.KNIGHT, chess.ROOK, chess.BISHOP]:
-                    move.promotion = promotion_piece
-                    board.push(move)
-                    history.append(board.fen())
-                    eval = -self.negamax(board, depth - 1, -beta, -alpha, -color, history)
-                    history.pop()
-                    board.pop()
-
-                    max_eval = max(max_eval, eval)
-                    alpha = max(alpha, eval)
-                    if alpha >= beta:
-                        break
-            else:
-                board.push(move)
-                history.append(board.fen())
-                eval = -self.negamax(board, depth - 1, -beta, -alpha, -color, history)
-                history.pop()
-                board.pop()
-
-                max_eval = max(max_eval, eval)
-                alpha = max(alpha, eval)
+        # legal_moves already lists every promotion piece separately
+        moves = self.move_orderer.order_moves(board, hash_move)
+        # The children of a frontier node are leaves: score them in batches
+        child_evals = self.child_evals(board, moves, depth)
+        for i, move in enumerate(moves):
+            if poll_alpha:
+                # A sibling at the root may have raised the bound
+                beta = min(beta, -self.shared_alpha.value)
                 if alpha >= beta:
+                    max_eval = max(max_eval, alpha)
                     break
+            child_eval = next(child_evals) if child_evals is not None else None
+            state.push(move)
+            eval = -self.negamax(state, depth - 1, -beta, -alpha, -color, static_eval=child_eval)
+            state.pop()
+
+            if eval > max_eval:
+                max_eval = eval
+                best_move = move
+                if poll_alpha:
+                    self.reply_floor = max_eval
+            alpha = max(alpha, eval)
+            if alpha >= beta:
+                self.move_orderer.record_cutoff(board, move, depth, i)
+                break
 
+        self.store(state, depth, max_eval, bound_flag(max_eval, alpha_orig, beta), best_move)
         return max_eval
 
-    def negamax_sequential(self, board, depth, history):
+    def negamax_sequential(self, state, depth, hash_move=None):
         """
         Runs negamax search sequentially (single-threaded).
         Returns the best move found within the given depth.
         """
+        board = state.board
         best_move = None
         max_eval = float('-inf')
         alpha, beta = float('-inf'), float('inf')
         color = 1 if board.turn == chess.WHITE else -1
+        # Best finished root move, kept in case the search times out
+        self.root_progress = None
 
-        for move in self.order_moves(board):
-            board.push(move)
-            history.append(board.fen())
-            eval = -self.negamax(board, depth - 1, -beta, -alpha, -color, history)
-            history.pop()
-            board.pop()
+        for move in self.move_orderer.order_moves(board, hash_move):
+            state.push(move)
+            eval = -self.negamax(state, depth - 1, -beta, -alpha, -color)
+            state.pop()
 
             if eval > max_eval:
                 max_eval = eval
                 best_move = move
+                self.root_progress = move
 
             alpha = max(alpha, eval)
             if alpha >= beta:
@@ -90,50 +194,66 @@ class NegamaxAlphaBeta(AIAlgorithm):
 
         return best_move
 
-    def negamax_parallel(self, board, depth, history):
+    def negamax_parallel(self, state, depth, hash_move=None):
         """
         Runs negamax search in parallel using multiple workers.
-        Distributes moves among workers, then chooses the best result.
+        The eldest (best-ordered) move is searched here first to set alpha,
+        then the younger siblings are handed to the workers. Every improvement
+        is published through shared_alpha so running workers can narrow their
+        windows and give up on moves that can no longer beat it.
         """
-        moves = list(self.order_moves(board))
-        worker_args = [
-            (board.copy(), move, depth, float('-inf'), float('inf'), 1 if board.turn == chess.WHITE else -1, history.copy())
-            for move in moves
-        ]
+        board = state.board
+        color = 1 if board.turn == chess.WHITE else -1
+        moves = self.move_orderer.order_moves(board, hash_move)
+        if len(moves) < 2:
+            return self.negamax_sequential(state, depth, hash_move)
 
-        with Pool(self.num_workers) as pool:
-            results = pool.map(self.negamax_parallel_worker, worker_args)
+        self.root_progress = None
+        first_move = moves[0]
+        state.push(first_move)
+        max_eval = -self.negamax(state, depth - 1, float('-inf'), float('inf'), -color)
+        state.pop()
+        best_move = first_move
+        self.root_progress = first_move
+        self.shared_alpha.value = max_eval
 
-        best_move = max(results, key=lambda x: x[1])[0]
+        position = compact_board(board)
+        # The node budget is shared through shared_nodes, so workers get the full limits
+        worker_args = [(position, move.uci(), depth, color, self.limits) for move in moves[1:]]
+        timed_out = False
+        for move_uci, eval, stats in self.imap_workers("negamax_parallel_worker", worker_args):
+            self.add_worker_stats(stats)
+            if eval is None:
+                timed_out = True
+            elif eval > max_eval:
+                max_eval = eval
+                best_move = chess.Move.from_uci(move_uci)
+                self.root_progress = best_move
+                self.shared_alpha.value = max_eval
+
+        if timed_out:
+            raise SearchTimeout
         return best_move
 
     def negamax_parallel_worker(self, args):
         """
         Worker function for parallel negamax.
-        Evaluates a single move at the given depth and returns (move, eval).
-        """
-        board, move, depth, alpha, beta, color, history = args
-        board.push(move)
-        history.append(board.fen())
-        eval = -self.negamax(board, depth - 1, -beta, -alpha, -color, history)
-        history.pop()
-        board.pop()
-        return move, eval
-
-    def order_moves(self, board):
-        """
-        Orders moves to try promising moves first:
-        captures, promotions, and checks have higher priority.
+        Searches one root move against the shared alpha and returns
+        (move, eval, search counters). Evals at or below alpha are only upper bounds,
+        which is fine since they can't become the best move; a refuted move
+        returns the bound it was refuted with. eval is None if the time ran out.
         """
-        def move_score(move):
-            score = 0
-            if board.is_capture(move):
-                captured_piece = board.piece_at(move.to_square)
-                score += 10 + (captured_piece.piece_type if captured_piece else 0)
-            if move.promotion:
-                score += 20
-            if board.gives_check(move):
-                score += 5
-            return score
-
-        return sorted(board.legal_moves, key=move_score, reverse=True)
+        position, move_uci, depth, color, limits = args
+        state = self.worker_state(position, move_uci, limits)
+        alpha = self.shared_alpha.value
+        self.reply_floor = float('-inf')
+        try:
+            eval = -self.negamax(state, depth - 1, float('-inf'), -alpha, -color, poll_alpha=True)
+        except RootMoveRefuted:
+            self.refuted_moves += 1
+            eval = -self.reply_floor
+        except SearchTimeout:
+            eval = None
+        finally:
+            self.reply_floor = None
+        return move_uci, eval, self.worker_stats()
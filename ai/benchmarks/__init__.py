@@ -0,0 +1,41 @@
+import time
+import timeit
+import chess
+
+# Positions the benchmarks share
+OPEN_GAME = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
+MIDDLEGAME = "r1bq1rk1/ppp2ppp/2np1n2/2b1p3/2B1P3/2NP1N2/PPP2PPP/R1BQ1RK1 w - - 0 7"
+QUEENS_GAMBIT = "r2q1rk1/pp2bppp/2n1pn2/3p4/3P4/2NBPN2/PP3PPP/R2Q1RK1 w - - 0 10"
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+ROOK_ENDGAME = "8/5pk1/6p1/8/3R4/6P1/5PKP/4r3 w - - 0 40"
+POSITIONS = [chess.STARTING_FEN, OPEN_GAME, MIDDLEGAME, ROOK_ENDGAME]
+
+
+def timed(fn, *args, **kwargs):
+    """
+    Calls fn once; returns (its result, seconds taken).
+    """
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def per_call(fn, calls):
+    """
+    Average seconds per call of fn over calls runs.
+    """
+    return timeit.timeit(fn, number=calls) / calls
+
+
+def random_games(rng, games, max_plies):
+    """
+    Every position from random games, every fifth one chess960.
+    The same board is yielded each time, one move further on.
+    """
+    for game in range(games):
+        board = chess.Board.from_chess960_pos(rng.randrange(960)) if game % 5 == 0 else chess.Board()
+        for _ in range(max_plies):
+            if board.is_game_over():
+                break
+            yield board
+            board.push(rng.choice(list(board.legal_moves)))
@@ -0,0 +1,32 @@
+import chess
+from ai.algorithms.mcts_policy_guided import MCTS, load_model
+from ai.benchmarks import POSITIONS, timed
+
+# Configuration
+SIMULATIONS = 400
+BATCH_SIZES = [1, 2, 4, 8, 16, 32]
+
+
+def run_batch_size(model, batch_size):
+    total_time = 0.0
+    top_moves = []
+    for fen in POSITIONS:
+        mcts = MCTS(chess.Board(fen), model, num_simulations=SIMULATIONS, batch_size=batch_size,
+                    early_stop=False)
+        _, elapsed = timed(mcts.run)
+        total_time += elapsed
+        best_move, _ = max(mcts.root_visit_counts(), key=lambda item: item[1])
+        top_moves.append(best_move.uci())
+    return len(POSITIONS) * SIMULATIONS / total_time, top_moves
+
+
+def main():
+    model = load_model()
+    print(f"MCTS, {SIMULATIONS} simulations, {len(POSITIONS)} positions")
+    print(f"{'batch':>6}{'sims/s':>10}   most visited")
+    for batch_size in BATCH_SIZES:
+        sims_per_second, top_moves = run_batch_size(model, batch_size)
+        print(f"{batch_size:>6}{sims_per_second:>10.0f}   {' '.join(top_moves)}")
+
+if __name__ == "__main__":
+    main()
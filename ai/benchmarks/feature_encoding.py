@@ -0,0 +1,72 @@
+import random
+import sys
+import chess
+import numpy as np
+from ai.benchmarks import per_call, random_games
+from ai.neural_network.utils import board_to_feature_vector, boards_to_feature_matrix, FEATURE_SIZE
+
+# Configuration
+GAMES = 100
+MAX_PLIES = 80
+CALLS = 3000
+BATCH_SIZES = [8, 64, 512]
+
+
+def loop_feature_vector(board):
+    """
+    The square-by-square encoder board_to_feature_vector used to be.
+    """
+    piece_map = {
+        chess.PAWN: 0, chess.KNIGHT: 1, chess.BISHOP: 2,
+        chess.ROOK: 3, chess.QUEEN: 4, chess.KING: 5
+    }
+    vector = np.zeros((64, 13), dtype=np.float32)
+    for sq in chess.SQUARES:
+        piece = board.piece_at(sq)
+        if piece is not None:
+            base_idx = piece_map[piece.piece_type]
+            if piece.color == chess.BLACK:
+                base_idx += 6
+            vector[sq, base_idx] = 1.0
+        else:
+            vector[sq, 12] = 1.0
+    feature_vector = vector.flatten()
+    side_to_move = 1.0 if board.turn == chess.WHITE else -1.0
+    feature_vector = np.concatenate((feature_vector, [side_to_move]))
+    castling_vec = [
+        1.0 if board.has_kingside_castling_rights(chess.WHITE) else 0.0,
+        1.0 if board.has_queenside_castling_rights(chess.WHITE) else 0.0,
+        1.0 if board.has_kingside_castling_rights(chess.BLACK) else 0.0,
+        1.0 if board.has_queenside_castling_rights(chess.BLACK) else 0.0
+    ]
+    feature_vector = np.concatenate((feature_vector, castling_vec))
+    return np.concatenate((feature_vector, [board.halfmove_clock, board.fullmove_number]))
+
+
+def main():
+    positions = [board.copy(stack=False) for board in random_games(random.Random(0), GAMES, MAX_PLIES)]
+    same = all(np.array_equal(loop_feature_vector(board), board_to_feature_vector(board)) for board in positions)
+    expected = np.stack([loop_feature_vector(board) for board in positions])
+    same_batch = np.array_equal(expected, boards_to_feature_matrix(positions))
+    print(f"{len(positions)} positions, identical features: single {same}, batch {same_batch}")
+
+    board = positions[len(positions) // 2]
+    buffer = np.empty(FEATURE_SIZE, dtype=np.float32)
+    loop = per_call(lambda: loop_feature_vector(board), CALLS)
+    print(f"{'encoder':>22}{'us/board':>10}{'speedup':>9}")
+    print(f"{'square loop':>22}{loop * 1e6:>10.1f}{1:>9.2f}")
+    for name, encode in (("bitboards", lambda: board_to_feature_vector(board)),
+                         ("bitboards, out buffer", lambda: board_to_feature_vector(board, buffer))):
+        per_board = per_call(encode, CALLS)
+        print(f"{name:>22}{per_board * 1e6:>10.1f}{loop / per_board:>9.2f}")
+    for batch_size in BATCH_SIZES:
+        batch = positions[:batch_size]
+        out = np.empty((batch_size, FEATURE_SIZE), dtype=np.float32)
+        calls = max(1, CALLS // batch_size)
+        per_board = per_call(lambda: boards_to_feature_matrix(batch, out), calls) / batch_size
+        print(f"{f'batch of {batch_size}':>22}{per_board * 1e6:>10.1f}{loop / per_board:>9.2f}")
+    if not (same and same_batch):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import random
+import sys
+import chess
+from ai.benchmarks import MIDDLEGAME, ROOK_ENDGAME, per_call, random_games
+from ai.evaluation.common import PIECE_VALUES, PIECE_SQUARE_TABLES, is_endgame
+from ai.evaluation.heuristic_evaluation import heuristic_evaluation
+
+# Configuration
+GAMES = 100
+MAX_PLIES = 200
+CALLS = 5000
+POSITIONS = [chess.STARTING_FEN, MIDDLEGAME, ROOK_ENDGAME]
+
+
+def loop_is_endgame(board):
+    """
+    is_endgame as it was, built on board.piece_map().
+    """
+    total_material = sum(PIECE_VALUES[piece.piece_type] for piece in board.piece_map().values()
+                         if piece.piece_type != chess.KING)
+    return total_material <= 1300
+
+
+def loop_heuristic_evaluation(board):
+    """
+    The square-by-square heuristic_evaluation the bitboard version replaced.
+    """
+    score = 0
+    endgame = loop_is_endgame(board)
+    for square in chess.SQUARES:
+        piece = board.piece_at(square)
+        if piece:
+            piece_value = PIECE_VALUES[piece.piece_type]
+            if piece.piece_type == chess.KING and endgame:
+                pst_value = PIECE_SQUARE_TABLES['endgame_king'][square if piece.color == chess.WHITE else chess.square_mirror(square)]
+            else:
+                pst_value = PIECE_SQUARE_TABLES[piece.piece_type][square if piece.color == chess.WHITE else chess.square_mirror(square)]
+            total_piece_value = piece_value + pst_value
+            score += total_piece_value if piece.color == chess.WHITE else -total_piece_value
+    return score
+
+
+def main():
+    checked, mismatches = 0, 0
+    for board in random_games(random.Random(0), GAMES, MAX_PLIES):
+        checked += 1
+        mismatches += (heuristic_evaluation(board) != loop_heuristic_evaluation(board)
+                       or is_endgame(board) != loop_is_endgame(board))
+    print(f"{checked} positions, {mismatches} score mismatches with the loop version")
+
+    print(f"{'pieces':>7}{'loop us':>10}{'bitboard us':>13}{'speedup':>9}")
+    for fen in POSITIONS:
+        board = chess.Board(fen)
+        loop = per_call(lambda: loop_heuristic_evaluation(board), CALLS)
+        bitboard = per_call(lambda: heuristic_evaluation(board), CALLS)
+        print(f"{len(board.piece_map()):>7}{loop * 1e6:>10.1f}{bitboard * 1e6:>13.1f}{loop / bitboard:>9.2f}")
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import chess
+from ai.algorithms.idpvs import IDPVS
+from ai.algorithms.negamax_alpha_beta import NegamaxAlphaBeta
+from ai.benchmarks import POSITIONS, timed
+from ai.evaluation.simple_net_evaluation import evaluate_board_with_simple_net, evaluate_boards_with_simple_net
+
+# Configuration
+DEPTH = 3
+BATCH_SIZES = [0, 1, 2, 4, 8, 16, 32, 64]
+EVAL_BOARDS = 512
+
+
+def sample_boards(count):
+    """
+    Children of the benchmark positions, repeated up to count boards.
+    """
+    children = []
+    for fen in POSITIONS:
+        board = chess.Board(fen)
+        for move in board.legal_moves:
+            board.push(move)
+            children.append(board.copy(stack=False))
+            board.pop()
+    return [children[i % len(children)] for i in range(count)]
+
+
+def evaluator_throughput(boards, batch_size):
+    """
+    Boards per second through the evaluator; batch size 0 is the single-board function.
+    """
+    if batch_size == 0:
+        _, elapsed = timed(lambda: [evaluate_board_with_simple_net(board) for board in boards])
+    else:
+        _, elapsed = timed(lambda: [evaluate_boards_with_simple_net(boards[i:i + batch_size])
+                                    for i in range(0, len(boards), batch_size)])
+    return len(boards) / elapsed
+
+
+def search_nps(algorithm_cls, batch_size, incremental_eval=False):
+    total_nodes = 0
+    total_time = 0.0
+    moves = []
+    for fen in POSITIONS:
+        algorithm = algorithm_cls(depth=DEPTH, leaf_batch_size=batch_size, incremental_eval=incremental_eval)
+        move, elapsed = timed(algorithm.get_best_move, chess.Board(fen))
+        total_time += elapsed
+        total_nodes += algorithm.search_stats["nodes"]
+        moves.append(move.uci())
+    return total_nodes, total_nodes / total_time, moves
+
+
+def main():
+    boards = sample_boards(EVAL_BOARDS)
+    evaluate_boards_with_simple_net(boards[:8])
+
+    print(f"Evaluator throughput, {EVAL_BOARDS} boards (batch 0 = one call per board)")
+    print(f"{'batch':>6}{'boards/s':>12}")
+    for batch_size in BATCH_SIZES:
+        print(f"{batch_size:>6}{evaluator_throughput(boards, batch_size):>12.0f}")
+
+    for algorithm_cls in (NegamaxAlphaBeta, IDPVS):
+        print(f"\n{algorithm_cls.__name__} depth {DEPTH}, {len(POSITIONS)} positions (leaf_batch_size 0 = off)")
+        print(f"{'batch':>6}{'nodes':>10}{'nps':>10}   best moves")
+        for batch_size in BATCH_SIZES:
+            nodes, nps, moves = search_nps(algorithm_cls, batch_size)
+            print(f"{batch_size:>6}{nodes:>10}{nps:>10.0f}   {' '.join(moves)}")
+        # The default: no batches, every leaf scored from the fc1 accumulator
+        nodes, nps, moves = search_nps(algorithm_cls, 0, incremental_eval=True)
+        print(f"{'incr':>6}{nodes:>10}{nps:>10.0f}   {' '.join(moves)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import chess
+from ai.algorithms.mcts_policy_guided import MCTS, load_model
+from ai.benchmarks import POSITIONS as BASE_POSITIONS, timed
+from ai.search import SearchLimits
+
+# Configuration
+SIMULATIONS = 800
+EXTENSION = 0.5
+MOVETIME = 1.0
+POSITIONS = BASE_POSITIONS + [
+    # Only one legal move: the king has to take the checking queen
+    "7k/8/8/8/8/8/6q1/7K w - - 0 1",
+]
+SETTINGS = {
+    "full": {"early_stop": False},
+    "early stop": {"early_stop": True},
+    "early + extend": {"early_stop": True, "extension": EXTENSION},
+}
+
+
+def run_setting(model, settings, movetime=None):
+    rows = []
+    for fen in POSITIONS:
+        mcts = MCTS(chess.Board(fen), model, num_simulations=SIMULATIONS, **settings)
+        limits = None
+        if movetime is not None:
+            # Bounded by time only, as MCTSPolicyGuided does with a movetime
+            limits = SearchLimits(movetime=movetime).start(check_interval=1)
+            mcts.num_simulations = 10 ** 9
+        _, elapsed = timed(mcts.run, limits)
+        move = mcts.choose_move()
+        rows.append((move.uci(), mcts.simulations, mcts.simulations_saved, mcts.extended_simulations, elapsed))
+    return rows
+
+
+def report(title, model, movetime=None):
+    print(title)
+    print(f"{'setting':>16}{'sims':>8}{'saved':>8}{'extra':>7}{'time':>8}   moves")
+    for name, settings in SETTINGS.items():
+        rows = run_setting(model, settings, movetime)
+        moves = " ".join(row[0] for row in rows)
+        sims, saved, extra, elapsed = (sum(row[i] for row in rows) for i in range(1, 5))
+        print(f"{name:>16}{sims:>8}{saved:>8}{extra:>7}{elapsed:>7.2f}s   {moves}")
+    print()
+
+
+def main():
+    model = load_model()
+    report(f"{SIMULATIONS} simulations per position, {len(POSITIONS)} positions", model)
+    report(f"{MOVETIME}s per position, {len(POSITIONS)} positions", model, MOVETIME)
+
+if __name__ == "__main__":
+    main()
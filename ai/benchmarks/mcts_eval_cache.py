@@ -0,0 +1,48 @@
+import chess
+from ai.algorithms.mcts_policy_guided import MCTSPolicyGuided
+from ai.benchmarks import timed
+
+# Configuration
+SIMULATIONS = 800
+PLIES = 20
+CACHE_SIZES = [0, 100_000]
+
+
+def play(cache_size):
+    """
+    Two MCTS players against each other; returns the moves, cache hits per
+    move and the number of cache lookups.
+    """
+    players = {
+        color: MCTSPolicyGuided(num_simulations=SIMULATIONS, early_stop=False, cache_size=cache_size)
+        for color in (chess.WHITE, chess.BLACK)
+    }
+    board = chess.Board()
+    moves, hits, lookups = [], [], 0
+    for _ in range(PLIES):
+        if board.is_game_over():
+            break
+        player = players[board.turn]
+        move = player.get_best_move(board)
+        stats = player.search_stats
+        hits.append(stats.get("cache_hits", 0))
+        lookups += stats.get("cache_hits", 0) + stats.get("cache_misses", 0)
+        board.push(move)
+        moves.append(move.uci())
+    return moves, hits, lookups
+
+
+def main():
+    print(f"MCTS self-play, {SIMULATIONS} simulations per move, {PLIES} plies")
+    baseline = None
+    for cache_size in CACHE_SIZES:
+        (moves, hits, lookups), elapsed = timed(play, cache_size)
+        hit_rate = sum(hits) / lookups if lookups else 0.0
+        same = "" if baseline is None else f"  same moves: {moves == baseline}"
+        baseline = baseline or moves
+        print(f"cache_size={cache_size:<7} time {elapsed:6.1f}s  hit rate {hit_rate:6.1%}  "
+              f"forward-pass leaves saved {sum(hits)}{same}")
+        print(f"  hits per move: {' '.join(map(str, hits))}")
+
+if __name__ == "__main__":
+    main()
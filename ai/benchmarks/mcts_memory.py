@@ -0,0 +1,30 @@
+import sys
+import chess
+from ai.algorithms.mcts_policy_guided import MCTS, load_model
+from ai.benchmarks import MIDDLEGAME, timed
+
+# Configuration (simulation count can be overridden on the command line)
+SIMULATIONS = 100_000
+MEMORY_MB = 256
+
+
+def main():
+    simulations = int(sys.argv[1]) if len(sys.argv) > 1 else SIMULATIONS
+    model = load_model()
+    mcts = MCTS(chess.Board(MIDDLEGAME), model, num_simulations=simulations, memory_mb=MEMORY_MB,
+                early_stop=False)
+
+    _, elapsed = timed(mcts.run)
+
+    stats = mcts.stats()
+    print(f"MCTS on one position, {simulations} simulations, {MEMORY_MB} MB budget")
+    print(f"simulations run    {stats['simulations']:>12}")
+    print(f"time s             {elapsed:>12.1f}")
+    print(f"sims/s             {stats['simulations'] / elapsed:>12.0f}")
+    print(f"tree nodes         {stats['nodes']:>12}")
+    print(f"tree MB            {stats['tree_mb']:>12.1f}")
+    print(f"bytes / simulation {stats['tree_bytes'] / stats['simulations']:>12.0f}")
+    print(f"boards built       {stats['boards_built']:>12}")
+
+if __name__ == "__main__":
+    main()
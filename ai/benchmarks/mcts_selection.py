@@ -0,0 +1,76 @@
+import math
+import chess
+import numpy as np
+from ai.benchmarks import MIDDLEGAME, KIWIPETE, per_call
+from ai.search import MCTSTree
+
+# Configuration
+CALLS = 20000
+C_PUCT = 1.0
+PATH_LENGTHS = [4, 8, 16, 64]
+POSITIONS = [chess.STARTING_FEN, MIDDLEGAME, KIWIPETE]
+
+
+def loop_select_child(tree, node, c_puct):
+    """
+    Per-child Python loop, the way MCTSNode.select_child used to score them.
+    """
+    best_score, best_child = -float("inf"), None
+    sqrt_parent = math.sqrt(max(1, int(tree.visits[node])))
+    for child in tree.children(node):
+        visits = int(tree.visits[child])
+        q = float(tree.value_sum[child]) / visits if visits else 0.0
+        u = c_puct * float(tree.prior[child]) * sqrt_parent / (1 + visits)
+        if q + u > best_score:
+            best_score, best_child = q + u, child
+    return best_child
+
+
+def loop_backup(tree, path, leaf_value):
+    value = -leaf_value
+    for node in reversed(path):
+        tree.visits[node] += 1
+        tree.value_sum[node] += value
+        value = -value
+
+
+def random_root(fen, rng):
+    """
+    A tree whose root children have random priors, visits and values.
+    """
+    board = chess.Board(fen)
+    moves = list(board.legal_moves)
+    priors = rng.dirichlet([0.3] * len(moves))
+    tree = MCTSTree()
+    tree.add_children(tree.root, list(zip(moves, priors)))
+    children = slice(1, tree.size)
+    tree.visits[children] = rng.integers(0, 100, len(moves))
+    tree.value_sum[children] = rng.uniform(-1, 1, len(moves)) * tree.visits[children]
+    tree.visits[tree.root] = tree.visits[children].sum()
+    return tree, len(moves)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"PUCT selection, {CALLS} calls")
+    print(f"{'children':>9}{'loop us':>10}{'numpy us':>10}{'speedup':>9}  same child")
+    for fen in POSITIONS:
+        tree, num_moves = random_root(fen, rng)
+        loop = per_call(lambda: loop_select_child(tree, tree.root, C_PUCT), CALLS)
+        vectorized = per_call(lambda: tree.select_child(tree.root, C_PUCT), CALLS)
+        same = loop_select_child(tree, tree.root, C_PUCT) == tree.select_child(tree.root, C_PUCT)
+        print(f"{num_moves:>9}{loop * 1e6:>10.1f}{vectorized * 1e6:>10.1f}{loop / vectorized:>9.2f}  {same}")
+
+    print(f"\nBackup, {CALLS} calls")
+    print(f"{'depth':>9}{'loop us':>10}{'numpy us':>10}{'speedup':>9}  same values")
+    for length in PATH_LENGTHS:
+        path = list(range(length))
+        loop_tree, numpy_tree = MCTSTree(length), MCTSTree(length)
+        loop = per_call(lambda: loop_backup(loop_tree, path, 0.25), CALLS)
+        vectorized = per_call(lambda: numpy_tree.backup(path, 0.25), CALLS)
+        same = (np.array_equal(loop_tree.visits, numpy_tree.visits)
+                and np.allclose(loop_tree.value_sum, numpy_tree.value_sum))
+        print(f"{length:>9}{loop * 1e6:>10.1f}{vectorized * 1e6:>10.1f}{loop / vectorized:>9.2f}  {same}")
+
+if __name__ == "__main__":
+    main()
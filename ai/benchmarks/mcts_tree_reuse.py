@@ -0,0 +1,46 @@
+import chess
+from ai.algorithms.mcts_policy_guided import MCTSPolicyGuided
+from ai.benchmarks import timed
+
+# Configuration
+SIMULATIONS = 800
+PLIES = 20
+# Single process, then root parallelization (workers' trees merged into the main one)
+MODES = {"serial": {}, "root": {"parallel": True, "num_workers": 2, "parallel_mode": "root"}}
+
+
+def play(reuse_tree, options):
+    """
+    Two MCTS players against each other; returns the visits each move inherited.
+    """
+    players = {
+        chess.WHITE: MCTSPolicyGuided(num_simulations=SIMULATIONS, reuse_tree=reuse_tree, **options),
+        chess.BLACK: MCTSPolicyGuided(num_simulations=SIMULATIONS, reuse_tree=reuse_tree, **options),
+    }
+    board = chess.Board()
+    history = []
+    inherited = []
+    for _ in range(PLIES):
+        if board.is_game_over():
+            break
+        player = players[board.turn]
+        move = player.get_best_move(board, history)
+        inherited.append(player.search_stats["inherited_visits"])
+        board.push(move)
+        history.append(move)
+    for player in players.values():
+        player.close()
+    return inherited
+
+
+def main():
+    print(f"MCTS self-play, {SIMULATIONS} simulations per move, {PLIES} plies")
+    for mode, options in MODES.items():
+        for reuse_tree in (False, True):
+            inherited, elapsed = timed(play, reuse_tree, options)
+            average = sum(inherited) / len(inherited)
+            print(f"{mode:<7}reuse_tree={reuse_tree!s:<6} time {elapsed:6.1f}s  "
+                  f"inherited visits per move {average:7.1f}  ({' '.join(map(str, inherited))})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import random
+import sys
+import chess
+from ai.benchmarks import KIWIPETE, per_call, random_games
+from ai.neural_network.utils import move_to_index, moves_to_indices, index_to_move
+
+# Configuration
+GAMES = 100
+MAX_PLIES = 200
+CALLS = 1000
+
+
+def loop_move_to_index(move: chess.Move, board: chess.Board) -> int:
+    """
+    The ray-walking move_to_index the lookup table replaced.
+    """
+    from_sq = move.from_square
+    to_sq = move.to_square
+    piece = board.piece_at(from_sq)
+    if piece is None:
+        raise ValueError("No piece at from_square.")
+
+    color = piece.color
+    piece_type = piece.piece_type
+
+    from_rank = from_sq // 8
+    from_file = from_sq % 8
+    to_rank = to_sq // 8
+    to_file = to_sq % 8
+
+    rank_diff = to_rank - from_rank
+    file_diff = to_file - from_file
+
+    direction_vectors = [
+        (-1, 0), (-1, 1), (0, 1), (1, 1),
+        (1, 0), (1, -1), (0, -1), (-1, -1)
+    ]
+    knight_moves = [
+        (-2, -1), (-2, 1), (-1, -2), (-1, 2),
+        (1, -2), (1, 2), (2, -1), (2, 1)
+    ]
+    king_moves = direction_vectors
+
+    move_subindex = None
+
+    # Sliding moves (Q,R,B)
+    if piece_type in [chess.QUEEN, chess.ROOK, chess.BISHOP]:
+        if piece_type == chess.ROOK:
+            valid_dirs = [0,2,4,6] # N,E,S,W
+        elif piece_type == chess.BISHOP:
+            valid_dirs = [1,3,5,7] # NE,SE,SW,NW
+        else:
+            valid_dirs = range(8) # Queen in all directions
+        for d_idx, (dr, df) in enumerate(direction_vectors):
+            if d_idx in valid_dirs:
+                step = 1
+                r, f = from_rank + dr, from_file + df
+                while 0 <= r < 8 and 0 <= f < 8 and step <= 7:
+                    if r == to_rank and f == to_file:
+                        move_subindex = d_idx * 7 + (step - 1)
+                        break
+                    r += dr
+                    f += df
+                    step += 1
+                if move_subindex is not None:
+                    break
+
+    # Knight moves
+    if move_subindex is None and piece_type == chess.KNIGHT:
+        for k_idx, (kr, kf) in enumerate(knight_moves):
+            if rank_diff == kr and file_diff == kf:
+                move_subindex = 56 + k_idx
+                break
+
+    # King normal moves
+    if move_subindex is None and piece_type == chess.KING:
+        for km_idx, (kr, kf) in enumerate(king_moves):
+            if rank_diff == kr and file_diff == kf:
+                move_subindex = 64 + km_idx
+                break
+
+    # King castling moves
+    # White kingside: e1->g1 rank_diff=0 file_diff=2
+    # White queenside: e1->c1 rank_diff=0 file_diff=-2
+    # Black kingside: e8->g8 rank_diff=0 file_diff=2
+    # Black queenside: e8->c8 rank_diff=0 file_diff=-2
+    if move_subindex is None and piece_type == chess.KING:
+        if rank_diff == 0 and file_diff == 2:
+            # Kingside castle
+            move_subindex = 72
+        elif rank_diff == 0 and file_diff == -2:
+            # Queenside castle
+            move_subindex = 73
+
+    # Pawn moves
+    if move_subindex is None and piece_type == chess.PAWN:
+        pawn_base = 74
+        if color == chess.WHITE:
+            direction = +1
+            start_rank = 1
+            last_rank = 7
+        else:
+            direction = -1
+            start_rank = 6
+            last_rank = 0
+
+        # Single push
+        if file_diff == 0 and rank_diff == direction:
+            move_subindex = pawn_base
+        # Double push
+        elif file_diff == 0 and from_rank == start_rank and rank_diff == 2*direction:
+            move_subindex = pawn_base + 1
+        # Capture left/right
+        elif rank_diff == direction and abs(file_diff) == 1:
+            if file_diff == -1:
+                move_subindex = pawn_base + 2
+            else:
+                move_subindex = pawn_base + 3
+
+        # Promotions
+        if move_subindex is not None and to_rank == last_rank:
+            promo_map = {chess.QUEEN:0, chess.ROOK:1, chess.BISHOP:2, chess.KNIGHT:3}
+            if move.promotion is not None:
+                promo_idx = promo_map[move.promotion]
+                # single push promotion: pawn_base+4..+7 (78..81)
+                # capture left promotion: pawn_base+8..+11 (82..85)
+                # capture right promotion: pawn_base+12..+15 (86..89)
+                if move_subindex == pawn_base:        # single push
+                    move_subindex = pawn_base + 4 + promo_idx
+                elif move_subindex == pawn_base + 2:  # capture left
+                    move_subindex = pawn_base + 8 + promo_idx
+                elif move_subindex == pawn_base + 3:  # capture right
+                    move_subindex = pawn_base + 12 + promo_idx
+
+    if move_subindex is None:
+        raise ValueError(f"Move {move.uci()} cannot be indexed by this scheme.")
+
+    final_index = from_sq * 90 + move_subindex
+    return final_index
+
+
+def loop_index_or_none(move, board):
+    try:
+        return loop_move_to_index(move, board)
+    except (ValueError, KeyError):
+        return None
+
+
+def check(rng):
+    """
+    Compares the table, the vectorized lookup and the inverse with the loop
+    version for every legal move. Returns (moves, mismatches).
+    """
+    moves_checked, mismatches = 0, 0
+    for board in random_games(rng, GAMES, MAX_PLIES):
+        legal_moves = list(board.legal_moves)
+        vectorized = moves_to_indices(board, legal_moves)
+        for move, vector_index in zip(legal_moves, vectorized):
+            expected = loop_index_or_none(move, board)
+            try:
+                index = move_to_index(move, board)
+            except ValueError:
+                index = None
+            vector_index = None if vector_index < 0 else int(vector_index)
+            ok = index == expected and vector_index == expected
+            if ok and expected is not None:
+                ok = index_to_move(expected, board.turn) == move
+            moves_checked += 1
+            mismatches += not ok
+    return moves_checked, mismatches
+
+
+def main():
+    moves_checked, mismatches = check(random.Random(0))
+    print(f"{moves_checked} legal moves, {mismatches} mismatches with the loop version")
+
+    board = chess.Board(KIWIPETE)
+    legal_moves = list(board.legal_moves)
+    loop = per_call(lambda: [loop_move_to_index(move, board) for move in legal_moves], CALLS)
+    table = per_call(lambda: [move_to_index(move, board) for move in legal_moves], CALLS)
+    vectorized = per_call(lambda: moves_to_indices(board, legal_moves), CALLS)
+    print(f"Indexing all {len(legal_moves)} legal moves: loop {loop * 1e6:.1f}us, "
+          f"table {table * 1e6:.1f}us ({loop / table:.1f}x), "
+          f"vectorized {vectorized * 1e6:.1f}us ({loop / vectorized:.1f}x)")
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import sys
+import chess
+from ai.algorithms.base import AIAlgorithm
+from ai.algorithms.mcts_policy_guided import MCTSPolicyGuided
+from ai.benchmarks import POSITIONS, timed
+
+# Configuration
+SIMULATIONS = 800
+MODES = ["root", "tree"]
+
+
+def run_workers(mode, num_workers):
+    total_time = 0.0
+    moves = []
+    with MCTSPolicyGuided(num_simulations=SIMULATIONS, parallel=num_workers > 1, num_workers=num_workers,
+                          parallel_mode=mode, reuse_tree=False, early_stop=False) as ai:
+        # Start the pool (and load the model in each worker) before timing
+        ai.get_best_move(chess.Board())
+        for fen in POSITIONS:
+            move, elapsed = timed(ai.get_best_move, chess.Board(fen))
+            total_time += elapsed
+            moves.append(move.uci())
+    return len(POSITIONS) * SIMULATIONS / total_time, moves
+
+
+def main():
+    # Usage: parallel_mcts.py [max workers]
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else max(2, AIAlgorithm.get_num_workers())
+    print(f"Parallel MCTS, {SIMULATIONS} simulations, {len(POSITIONS)} positions")
+    print(f"{'mode':>6}{'workers':>9}{'sims/s':>10}{'speedup':>9}   chosen moves")
+    for mode in MODES:
+        baseline = None
+        for num_workers in range(1, max_workers + 1):
+            sims_per_second, moves = run_workers(mode, num_workers)
+            baseline = baseline or sims_per_second
+            print(f"{mode:>6}{num_workers:>9}{sims_per_second:>10.0f}{sims_per_second / baseline:>9.2f}   "
+                  f"{' '.join(moves)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import chess
+from ai.algorithms.negamax_alpha_beta import NegamaxAlphaBeta
+from ai.benchmarks import OPEN_GAME, MIDDLEGAME, QUEENS_GAMBIT, timed
+
+# Configuration
+DEPTH = 3
+NUM_WORKERS = 4
+POSITIONS = [chess.STARTING_FEN, OPEN_GAME, MIDDLEGAME, QUEENS_GAMBIT]
+
+
+def run(algorithm, fen):
+    move, elapsed = timed(algorithm.get_best_move, chess.Board(fen), [], DEPTH)
+    return move, algorithm.search_stats["nodes"], elapsed
+
+
+def main():
+    sequential = NegamaxAlphaBeta(depth=DEPTH)
+    parallel = NegamaxAlphaBeta(depth=DEPTH, parallel=True, num_workers=NUM_WORKERS)
+    # Start the workers up front so pool start-up isn't timed
+    parallel.get_pool()
+
+    print(f"Depth {DEPTH}, {NUM_WORKERS} workers")
+    print(f"{'position':<10}{'seq nodes':>12}{'par nodes':>12}{'overhead':>10}{'seq s':>9}{'par s':>9}")
+    with parallel:
+        for i, fen in enumerate(POSITIONS):
+            seq_move, seq_nodes, seq_time = run(sequential, fen)
+            par_move, par_nodes, par_time = run(parallel, fen)
+            overhead = par_nodes / seq_nodes
+            print(f"{i:<10}{seq_nodes:>12}{par_nodes:>12}{overhead:>10.2f}{seq_time:>9.2f}{par_time:>9.2f}"
+                  f"   {seq_move.uci()} / {par_move.uci()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import chess
+from ai.algorithms.idpvs import IDPVS
+from ai.benchmarks import POSITIONS as BASE_POSITIONS, QUEENS_GAMBIT, timed
+
+# Configuration
+DEPTH = 4
+POSITIONS = BASE_POSITIONS + [QUEENS_GAMBIT]
+FEATURES = ["null_move", "late_move_reductions", "futility_pruning", "razoring"]
+CONFIGS = {
+    "plain": {},
+    **{name: {name: True} for name in FEATURES},
+    "all": {name: True for name in FEATURES},
+}
+
+
+def run_config(options):
+    total_nodes = 0
+    total_time = 0.0
+    moves = []
+    for fen in POSITIONS:
+        settings = {name: False for name in FEATURES}
+        settings.update(options)
+        # Fresh instance per position so the transposition table starts empty
+        algorithm = IDPVS(depth=DEPTH, **settings)
+        move, elapsed = timed(algorithm.get_best_move, chess.Board(fen), [])
+        total_time += elapsed
+        total_nodes += algorithm.search_stats["nodes"]
+        moves.append(move.uci())
+    return total_nodes, total_time, moves
+
+
+def main():
+    print(f"IDPVS depth {DEPTH}, {len(POSITIONS)} positions")
+    print(f"{'config':<24}{'nodes':>10}{'time s':>10}   best moves")
+    for name, options in CONFIGS.items():
+        nodes, elapsed, moves = run_config(options)
+        print(f"{name:<24}{nodes:>10}{elapsed:>10.2f}   {' '.join(moves)}")
+
+if __name__ == "__main__":
+    main()
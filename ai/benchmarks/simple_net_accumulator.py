@@ -0,0 +1,84 @@
+import random
+import sys
+import chess
+import torch
+from ai.benchmarks import KIWIPETE, per_call
+from ai.evaluation.simple_net_accumulator import SimpleNetAccumulator
+from ai.evaluation.simple_net_evaluation import simple_model, device
+from ai.neural_network.utils import board_to_feature_vector
+
+# Configuration
+LINES = 200
+LINE_LENGTH = 60
+TOLERANCE = 1e-4
+CALLS = 2000
+POSITIONS = [
+    chess.STARTING_FEN,
+    # Castling both ways, en passant and promotions come up quickly from these
+    KIWIPETE,
+    "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+    "8/P1k5/8/8/8/8/1p4K1/8 w - - 0 60",
+]
+
+
+def full_forward(board):
+    features = torch.tensor(board_to_feature_vector(board), dtype=torch.float32).unsqueeze(0).to(device)
+    with torch.no_grad():
+        return simple_model()(features).item()
+
+
+def check_agreement(rng):
+    """
+    Plays random lines (null moves included) through the accumulator and
+    compares it with the full forward pass after every push and every pop.
+    Returns (positions checked, largest difference).
+    """
+    checked, worst = 0, 0.0
+    for line in range(LINES):
+        board = chess.Board(POSITIONS[line % len(POSITIONS)])
+        accumulator = SimpleNetAccumulator(board)
+        played = 0
+        while played < LINE_LENGTH and not board.is_game_over():
+            moves = list(board.legal_moves)
+            move = chess.Move.null() if rng.random() < 0.05 and not board.is_check() else rng.choice(moves)
+            accumulator.push(move)
+            played += 1
+            worst = max(worst, abs(accumulator.nn_score() - full_forward(board)))
+            checked += 1
+        for _ in range(played):
+            accumulator.pop()
+            worst = max(worst, abs(accumulator.nn_score() - full_forward(board)))
+            checked += 1
+    return checked, worst
+
+
+def main():
+    rng = random.Random(0)
+    checked, worst = check_agreement(rng)
+    ok = worst <= TOLERANCE
+    print(f"Accumulator vs full forward pass: {checked} positions, "
+          f"max difference {worst:.2e} (tolerance {TOLERANCE:.0e})  {'OK' if ok else 'FAIL'}")
+
+    board = chess.Board(POSITIONS[1])
+    accumulator = SimpleNetAccumulator(board)
+    move = next(iter(board.legal_moves))
+
+    def incremental_leaf():
+        accumulator.push(move)
+        accumulator.nn_score()
+        accumulator.pop()
+
+    def full_leaf():
+        board.push(move)
+        full_forward(board)
+        board.pop()
+
+    full = per_call(full_leaf, CALLS)
+    incremental = per_call(incremental_leaf, CALLS)
+    print(f"Per leaf (push, net score, pop): full {full * 1e6:.1f}us, "
+          f"accumulator {incremental * 1e6:.1f}us, speedup {full / incremental:.2f}x")
+    if not ok:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
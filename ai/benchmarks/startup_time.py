@@ -0,0 +1,63 @@
+import subprocess
+import sys
+from ai.benchmarks import timed
+
+# Configuration
+RUNS = 3
+# What each step runs in a fresh interpreter, one after the other
+STEPS = {
+    "menu (import main)": "import main",
+    "cli menus": "import cli, cli.algorithm_selector",
+    "+ heuristic algorithm": "import ai.algorithms.heuristic",
+    "+ mcts algorithm": "import ai.algorithms.mcts_policy_guided",
+    "+ first model load": "from ai.neural_network.model_registry import get_model; get_model('policy_value')",
+}
+# None of these should be imported before an algorithm is picked
+HEAVY_MODULES = ("torch", "numpy", "ai.evaluation.simple_net_evaluation", "ai.evaluation.policy_value_evaluation")
+
+
+def time_code(code):
+    """
+    Best wall time over RUNS fresh interpreters running code.
+    """
+    best = float("inf")
+    for _ in range(RUNS):
+        _, elapsed = timed(subprocess.run, [sys.executable, "-c", code], check=True)
+        best = min(best, elapsed)
+    return best
+
+
+def heavy_modules_after(code):
+    check = f"{code}; import sys; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", check], check=True, capture_output=True, text=True)
+    return result.stdout.split()
+
+
+def check_sharing():
+    """
+    The evaluator and MCTS should end up with one and the same network.
+    """
+    from ai.algorithms.mcts_policy_guided import load_model
+    from ai.evaluation.policy_value_evaluation import policy_value_model
+    from ai.neural_network.model_registry import loaded_models
+    return load_model() is policy_value_model() and len(loaded_models()) == 1
+
+
+def main():
+    baseline = time_code("pass")
+    print(f"{'step':>24}{'time':>9}")
+    print(f"{'python itself':>24}{baseline:>8.2f}s")
+    code = ""
+    for name, step in STEPS.items():
+        code = f"{code}; {step}" if code else step
+        print(f"{name:>24}{time_code(code):>8.2f}s")
+
+    heavy = heavy_modules_after("import main, cli.algorithm_selector")
+    print(f"Loaded by the menus: {', '.join(heavy) or 'nothing heavy'}  {'FAIL' if heavy else 'OK'}")
+    shared = check_sharing()
+    print(f"MCTS and the evaluator share one policy-value model: {'OK' if shared else 'FAIL'}")
+    if heavy or not shared:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
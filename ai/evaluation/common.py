@@ -90,5 +90,11 @@ def is_endgame(board):
     Check if we're in the endgame by summing up material (excluding kings).
     If it's low enough, we consider it endgame.
     """
-    total_material = sum(PIECE_VALUES[piece.piece_type] for piece in board.piece_map().values() if piece.piece_type != chess.KING)
+    total_material = (
+        PIECE_VALUES[chess.PAWN] * chess.popcount(board.pawns)
+        + PIECE_VALUES[chess.KNIGHT] * chess.popcount(board.knights)
+        + PIECE_VALUES[chess.BISHOP] * chess.popcount(board.bishops)
+        + PIECE_VALUES[chess.ROOK] * chess.popcount(board.rooks)
+        + PIECE_VALUES[chess.QUEEN] * chess.popcount(board.queens)
+    )
     return total_material <= 1300
\ No newline at end of file
@@ -1,20 +1,35 @@
 import chess
+import numpy as np
 from .common import PIECE_VALUES, PIECE_SQUARE_TABLES, is_endgame
 
-def heuristic_evaluation(board, move_history=None):
-    # Basic heuristic using material and positional tables
-    score = 0
-    endgame = is_endgame(board)
+PIECE_ORDER = [(piece_type, color) for color in (chess.WHITE, chess.BLACK) for piece_type in chess.PIECE_TYPES]
+
 
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece:
-            piece_value = PIECE_VALUES[piece.piece_type]
-            if piece.piece_type == chess.KING and endgame:
-                pst_value = PIECE_SQUARE_TABLES['endgame_king'][square if piece.color == chess.WHITE else chess.square_mirror(square)]
+def _build_score_tables():
+    """
+    Material + piece-square value of each piece on each square, from White's
+    view, flattened as (piece, square). Row 0 uses the middlegame king
+    table, row 1 the endgame one.
+    """
+    tables = np.zeros((2, len(PIECE_ORDER) * 64), dtype=np.float64)
+    for endgame in (False, True):
+        for i, (piece_type, color) in enumerate(PIECE_ORDER):
+            if piece_type == chess.KING and endgame:
+                pst = PIECE_SQUARE_TABLES['endgame_king']
             else:
-                pst_value = PIECE_SQUARE_TABLES[piece.piece_type][square if piece.color == chess.WHITE else chess.square_mirror(square)]
-            total_piece_value = piece_value + pst_value
-            score += total_piece_value if piece.color == chess.WHITE else -total_piece_value
+                pst = PIECE_SQUARE_TABLES[piece_type]
+            for square in chess.SQUARES:
+                value = PIECE_VALUES[piece_type] + pst[square if color == chess.WHITE else chess.square_mirror(square)]
+                tables[int(endgame), i * 64 + square] = value if color == chess.WHITE else -value
+    return tables
+
 
-    return score
+SCORE_TABLES = _build_score_tables()
+
+
+def heuristic_evaluation(board, move_history=None):
+    # Basic heuristic using material and positional tables:
+    # the piece bitboards unpacked to bits, dotted with the precomputed values
+    masks = np.array([board.pieces_mask(piece_type, color) for piece_type, color in PIECE_ORDER], dtype="<u8")
+    bits = np.unpackbits(masks.view(np.uint8), bitorder="little")
+    return float(bits @ SCORE_TABLES[int(is_endgame(board))])
@@ -1,19 +1,17 @@
 import chess
+import numpy as np
 import torch
-from ai.neural_network.policy_value_net import PolicyValueNet
-from ai.neural_network.utils import board_to_feature_vector
+from ai.neural_network.model_registry import get_model, DEVICE as device
+from ai.neural_network.utils import board_to_feature_vector, boards_to_feature_matrix
 from .heuristic_evaluation import heuristic_evaluation
 
-device = torch.device("mps") if torch.backends.mps.is_available() else torch.device("cpu")
 
-INPUT_DIM = 839
-POLICY_SIZE = 5760
-HIDDEN_DIM = 256
+def policy_value_model():
+    """
+    The shared PolicyValueNet, loaded on first use.
+    """
+    return get_model("policy_value")
 
-PV_MODEL = PolicyValueNet(INPUT_DIM, POLICY_SIZE, HIDDEN_DIM)
-PV_MODEL.load_state_dict(torch.load("model/policy_value_model.pt", map_location=device))
-PV_MODEL.to(device)
-PV_MODEL.eval()
 
 def evaluate_board_with_policy_value(board, move_history=None):
     # Blend NN value with heuristic
@@ -27,12 +25,31 @@ def evaluate_board_with_policy_value(board, move_history=None):
             return 0
 
     fv = board_to_feature_vector(board)
-    input_tensor = torch.tensor(fv, dtype=torch.float32).unsqueeze(0).to(device)
+    input_tensor = torch.from_numpy(fv).unsqueeze(0).to(device)
     with torch.no_grad():
-        policy_out, value_out = PV_MODEL(input_tensor)
+        policy_out, value_out = policy_value_model()(input_tensor)
         nn_value = value_out.item()
 
     h_score = heuristic_evaluation(board, move_history)
     scaled_h = h_score / 1000.0
     final = 0.7 * nn_value + 0.3 * scaled_h
     return final * 1000.0
+
+
+def evaluate_boards_with_policy_value(boards, model=None):
+    """
+    Batched policy and value for non-terminal boards in one forward pass.
+    Returns (policy probabilities as a (batch, POLICY_SIZE) array,
+    blended values in the same centipawn scale as evaluate_board_with_policy_value).
+    """
+    model = model if model is not None else policy_value_model()
+    features = boards_to_feature_matrix(boards)
+    input_tensor = torch.from_numpy(features).to(device)
+    with torch.no_grad():
+        policy_out, value_out = model(input_tensor)
+        policy_probs = torch.softmax(policy_out, dim=1).cpu().numpy()
+        nn_values = value_out.squeeze(1).cpu().numpy().astype(np.float64)
+
+    h_scores = np.array([heuristic_evaluation(board) for board in boards], dtype=np.float64)
+    values = (0.7 * nn_values + 0.3 * h_scores / 1000.0) * 1000.0
+    return policy_probs, values
@@ -0,0 +1,141 @@
+import chess
+import numpy as np
+from .simple_net_evaluation import simple_model, NN_WEIGHT, HEURISTIC_WEIGHT
+from .heuristic_evaluation import heuristic_evaluation
+
+# Layout of board_to_feature_vector: 13 channels per square (12 pieces + empty),
+# then side to move, 4 castling rights, halfmove clock and fullmove number
+CHANNELS = 13
+EMPTY_CHANNEL = 12
+TAIL_START = 64 * CHANNELS
+
+
+def square_channel(board, square):
+    """
+    Which of the 13 one-hot channels is set for a square.
+    """
+    piece_type = board.piece_type_at(square)
+    if piece_type is None:
+        return EMPTY_CHANNEL
+    black = not board.occupied_co[chess.WHITE] & chess.BB_SQUARES[square]
+    return piece_type - 1 + (6 if black else 0)
+
+
+def castling_features(board):
+    return [
+        board.has_kingside_castling_rights(chess.WHITE),
+        board.has_queenside_castling_rights(chess.WHITE),
+        board.has_kingside_castling_rights(chess.BLACK),
+        board.has_queenside_castling_rights(chess.BLACK),
+    ]
+
+
+def tail_features(board):
+    """
+    The last 7 features: side to move, castling rights and move counters.
+    """
+    return np.array([1.0 if board.turn == chess.WHITE else -1.0, *castling_features(board),
+                     board.halfmove_clock, board.fullmove_number], dtype=np.float32)
+
+
+class SimpleNetAccumulator:
+    """
+    SimpleChessNet evaluation that keeps fc1's output up to date as moves
+    are played, NNUE style.
+
+    The input is one-hot per square, so a move only changes the features of
+    the 2-4 squares it touches plus the 7 tail features. push() adds and
+    subtracts the matching fc1 weight rows instead of redoing the whole
+    839 x 256 product, and pop() takes the previous accumulator off a stack.
+    Evaluating a position then only costs fc2 and fc3.
+
+    Use it like a board: push/pop moves through it, not on the board directly.
+    """
+
+    def __init__(self, board, model=None):
+        self.board = board
+        model = model if model is not None else simple_model()
+        # Row i is the fc1 weight column for input feature i
+        self.rows = model.fc1.weight.detach().cpu().numpy().T.copy()
+        self.bias1 = model.fc1.bias.detach().cpu().numpy()
+        self.weight2 = model.fc2.weight.detach().cpu().numpy()
+        self.bias2 = model.fc2.bias.detach().cpu().numpy()
+        self.weight3 = model.fc3.weight.detach().cpu().numpy()[0]
+        self.bias3 = float(model.fc3.bias.detach().cpu().numpy()[0])
+        self.stack = [self.full_accumulator(board)]
+
+    def full_accumulator(self, board):
+        """
+        fc1's pre-activation output computed from scratch.
+        """
+        active = [square * CHANNELS + square_channel(board, square) for square in chess.SQUARES]
+        return self.bias1 + self.rows[active].sum(axis=0) + tail_features(board) @ self.rows[TAIL_START:]
+
+    @property
+    def accumulator(self):
+        return self.stack[-1]
+
+    def touched_squares(self, move):
+        """
+        Squares whose contents a move can change.
+        """
+        board = self.board
+        if not move:
+            return []
+        if board.is_castling(move):
+            # The king and rook both move along the back rank (any chess960 setup too)
+            rank = chess.square_rank(move.from_square)
+            return [chess.square(file, rank) for file in range(8)]
+        squares = [move.from_square, move.to_square]
+        if board.is_en_passant(move):
+            squares.append(chess.square(chess.square_file(move.to_square), chess.square_rank(move.from_square)))
+        return squares
+
+    def push(self, move):
+        board = self.board
+        squares = self.touched_squares(move)
+        before = [square_channel(board, square) for square in squares]
+        castling_rights = board.castling_rights
+        castling_before = castling_features(board)
+        halfmove_clock = board.halfmove_clock
+        board.push(move)
+
+        rows = self.rows
+        accumulator = self.stack[-1].copy()
+        for square, old in zip(squares, before):
+            new = square_channel(board, square)
+            if new != old:
+                accumulator += rows[square * CHANNELS + new] - rows[square * CHANNELS + old]
+        # Tail: the side to move flips, the clocks move on, castling rights may go
+        side = TAIL_START
+        accumulator += rows[side] * (2.0 if board.turn == chess.WHITE else -2.0)
+        if board.castling_rights != castling_rights:
+            change = np.subtract(castling_features(board), castling_before, dtype=np.float32)
+            accumulator += change @ rows[side + 1:side + 5]
+        accumulator += rows[side + 5] * float(board.halfmove_clock - halfmove_clock)
+        if board.turn == chess.WHITE:
+            accumulator += rows[side + 6]
+        self.stack.append(accumulator)
+
+    def pop(self):
+        self.stack.pop()
+        return self.board.pop()
+
+    def nn_score(self):
+        """
+        The net's output for the current position: fc2 and fc3 only.
+        """
+        hidden = np.maximum(self.stack[-1], 0.0)
+        hidden = np.maximum(self.weight2 @ hidden + self.bias2, 0.0)
+        return float(self.weight3 @ hidden + self.bias3)
+
+    def evaluate(self, heuristic_score=None):
+        """
+        Same score as evaluate_board_with_simple_net for the current position.
+        """
+        board = self.board
+        if board.is_game_over():
+            result = board.result()
+            return 1000 if result == "1-0" else -1000 if result == "0-1" else 0
+        h_score = heuristic_score if heuristic_score is not None else heuristic_evaluation(board)
+        return (NN_WEIGHT * self.nn_score() + HEURISTIC_WEIGHT * h_score / 1000.0) * 1000.0
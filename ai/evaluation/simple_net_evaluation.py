@@ -1,19 +1,21 @@
 import chess
+import numpy as np
 import torch
-from ai.neural_network.simple_chess_net import SimpleChessNet
-from ai.neural_network.utils import board_to_feature_vector
+from ai.neural_network.model_registry import get_model, DEVICE as device
+from ai.neural_network.utils import board_to_feature_vector, boards_to_feature_matrix
 from .heuristic_evaluation import heuristic_evaluation
 
-device = torch.device("mps") if torch.backends.mps.is_available() else torch.device("cpu")
+# Blend weights for the net and the heuristic
+NN_WEIGHT = 0.7
+HEURISTIC_WEIGHT = 0.3
 
-INPUT_SIZE = 839
-HIDDEN_SIZE = 256
-OUTPUT_SIZE = 1
 
-SIMPLE_MODEL = SimpleChessNet(INPUT_SIZE, HIDDEN_SIZE, OUTPUT_SIZE)
-SIMPLE_MODEL.load_state_dict(torch.load("model/simple_model.pt", map_location=device))
-SIMPLE_MODEL.to(device)
-SIMPLE_MODEL.eval()
+def simple_model():
+    """
+    The shared SimpleChessNet, loaded on first use.
+    """
+    return get_model("simple")
+
 
 def evaluate_board_with_simple_net(board, move_history=None):
     # Blend simple net evaluation with heuristic
@@ -27,11 +29,38 @@ def evaluate_board_with_simple_net(board, move_history=None):
             return 0
 
     fv = board_to_feature_vector(board)
-    input_tensor = torch.tensor(fv, dtype=torch.float32).unsqueeze(0).to(device)
+    input_tensor = torch.from_numpy(fv).unsqueeze(0).to(device)
     with torch.no_grad():
-        nn_score = SIMPLE_MODEL(input_tensor).item()
+        nn_score = simple_model()(input_tensor).item()
 
     h_score = heuristic_evaluation(board, move_history)
     scaled_h = h_score / 1000.0
-    final = 0.7 * nn_score + 0.3 * scaled_h
+    final = NN_WEIGHT * nn_score + HEURISTIC_WEIGHT * scaled_h
     return final * 1000.0
+
+
+def evaluate_boards_with_simple_net(boards):
+    """
+    Batch version of evaluate_board_with_simple_net.
+    Scores every board with one forward pass and returns a numpy array
+    (same scale and sign as the single-board version).
+    """
+    scores = np.zeros(len(boards), dtype=np.float64)
+    pending = []
+    for i, board in enumerate(boards):
+        if board.is_game_over():
+            result = board.result()
+            scores[i] = 1000 if result == "1-0" else -1000 if result == "0-1" else 0
+        else:
+            pending.append(i)
+    if not pending:
+        return scores
+
+    features = boards_to_feature_matrix([boards[i] for i in pending])
+    input_tensor = torch.from_numpy(features).to(device)
+    with torch.no_grad():
+        nn_scores = simple_model()(input_tensor).squeeze(1).cpu().numpy()
+
+    h_scores = np.array([heuristic_evaluation(boards[i]) for i in pending], dtype=np.float64)
+    scores[pending] = (NN_WEIGHT * nn_scores + HEURISTIC_WEIGHT * h_scores / 1000.0) * 1000.0
+    return scores
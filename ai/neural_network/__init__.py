@@ -1,3 +1,6 @@
 from .simple_chess_net import SimpleChessNet
 from .policy_value_net import PolicyValueNet
-from .utils import board_to_feature_vector, move_to_index
+from .utils import (
+    board_to_feature_vector, boards_to_feature_matrix, move_to_index, moves_to_indices, index_to_move
+)
+from .model_registry import get_model
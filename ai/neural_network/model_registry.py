@@ -0,0 +1,57 @@
+import os
+import threading
+import torch
+from .simple_chess_net import SimpleChessNet
+from .policy_value_net import PolicyValueNet
+
+DEVICE = torch.device("mps") if torch.backends.mps.is_available() else torch.device("cpu")
+
+# How to build each network (sizes must match training) and where its weights live
+NETWORKS = {
+    "simple": lambda: SimpleChessNet(839, 256, 1),
+    "policy_value": lambda: PolicyValueNet(839, 5760, 256),
+}
+DEFAULT_PATHS = {
+    "simple": "model/simple_model.pt",
+    "policy_value": "model/policy_value_model.pt",
+}
+
+_MODELS = {}
+_LOCK = threading.Lock()
+
+
+def get_model(network, path=None, device=None):
+    """
+    The shared model for a network ("simple" or "policy_value"), with the
+    weights from path (the network's default file if not given) on device.
+    Nothing is loaded until the first call; after that every caller asking
+    for the same (path, device) gets the same instance.
+    """
+    path = path or DEFAULT_PATHS[network]
+    device = torch.device(device) if device is not None else DEVICE
+    key = (os.path.abspath(path), str(device))
+    model = _MODELS.get(key)
+    if model is None:
+        with _LOCK:
+            model = _MODELS.get(key)
+            if model is None:
+                model = _load(network, path, device)
+                _MODELS[key] = model
+    return model
+
+
+def _load(network, path, device):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Model weights not found: {path} (train the {network} network first)")
+    model = NETWORKS[network]()
+    model.load_state_dict(torch.load(path, map_location=device))
+    model.to(device)
+    model.eval()
+    return model
+
+
+def loaded_models():
+    """
+    (path, device) of every model loaded so far.
+    """
+    return list(_MODELS)
@@ -2,50 +2,180 @@
 import numpy as np
 import chess
 
-def board_to_feature_vector(board: chess.Board) -> np.ndarray:
+# 13 channels per square (12 pieces + empty), then side to move,
+# 4 castling rights, halfmove clock and fullmove number
+FEATURE_SIZE = 839
+PLANE_FEATURES = 64 * 13
+PIECE_CHANNELS = [
+    (piece_type, color)
+    for color in (chess.WHITE, chess.BLACK)
+    for piece_type in (chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN, chess.KING)
+]
+
+
+def _channel_masks(board, out):
+    """
+    Writes the 13 channel bitboards (12 pieces + empty) into out.
+    """
+    for i, (piece_type, color) in enumerate(PIECE_CHANNELS):
+        out[i] = board.pieces_mask(piece_type, color)
+    out[12] = ~board.occupied & chess.BB_ALL
+
+
+def _tail_features(board, out):
+    """
+    Writes side to move, castling rights and the move counters into out.
+    """
+    out[0] = 1.0 if board.turn == chess.WHITE else -1.0
+    out[1] = board.has_kingside_castling_rights(chess.WHITE)
+    out[2] = board.has_queenside_castling_rights(chess.WHITE)
+    out[3] = board.has_kingside_castling_rights(chess.BLACK)
+    out[4] = board.has_queenside_castling_rights(chess.BLACK)
+    out[5] = board.halfmove_clock
+    out[6] = board.fullmove_number
+
+
+def _unpack_planes(masks):
+    """
+    (..., 13) bitboards -> (..., 64 * 13) one-hot planes, square-major.
+    """
+    bits = np.unpackbits(masks.astype("<u8").view(np.uint8), axis=-1, bitorder="little")
+    bits = bits.reshape(masks.shape[:-1] + (13, 64))
+    return np.swapaxes(bits, -1, -2).reshape(masks.shape[:-1] + (PLANE_FEATURES,))
+
+
+def board_to_feature_vector(board: chess.Board, out: np.ndarray = None) -> np.ndarray:
     """
     Convert board to a numeric vector.
     Includes pieces, side to move, castling rights, and move counters.
+    Built from the piece bitboards; pass out (FEATURE_SIZE float32s) to
+    reuse a buffer.
     """
-    piece_map = {
-        chess.PAWN: 0, chess.KNIGHT: 1, chess.BISHOP: 2,
-        chess.ROOK: 3, chess.QUEEN: 4, chess.KING: 5
-    }
-
-    # One-hot encode each square for all piece types + empty
-    # 64 squares, 13 channels (12 pieces + 1 empty)
-    vector = np.zeros((64, 13), dtype=np.float32)
-    for sq in chess.SQUARES:
-        piece = board.piece_at(sq)
-        if piece is not None:
-            base_idx = piece_map[piece.piece_type]
-            if piece.color == chess.BLACK:
-                base_idx += 6
-            vector[sq, base_idx] = 1.0
-        else:
-            vector[sq, 12] = 1.0
-
-    feature_vector = vector.flatten()
-
-    # Add side to move (+1 for White, -1 for Black)
-    side_to_move = 1.0 if board.turn == chess.WHITE else -1.0
-    feature_vector = np.concatenate((feature_vector, [side_to_move]))
-
-    # Add castling rights for both sides
-    castling_vec = [
-        1.0 if board.has_kingside_castling_rights(chess.WHITE) else 0.0,
-        1.0 if board.has_queenside_castling_rights(chess.WHITE) else 0.0,
-        1.0 if board.has_kingside_castling_rights(chess.BLACK) else 0.0,
-        1.0 if board.has_queenside_castling_rights(chess.BLACK) else 0.0
-    ]
-    feature_vector = np.concatenate((feature_vector, castling_vec))
-
-    # Add halfmove clock and fullmove number
-    feature_vector = np.concatenate((feature_vector, [board.halfmove_clock, board.fullmove_number]))
-
-    return feature_vector
+    if out is None:
+        out = np.empty(FEATURE_SIZE, dtype=np.float32)
+    masks = np.empty(13, dtype=np.uint64)
+    _channel_masks(board, masks)
+    out[:PLANE_FEATURES] = _unpack_planes(masks)
+    _tail_features(board, out[PLANE_FEATURES:])
+    return out
+
+
+def boards_to_feature_matrix(boards, out: np.ndarray = None) -> np.ndarray:
+    """
+    board_to_feature_vector for a list of boards, as one (len(boards), FEATURE_SIZE)
+    float32 array (or written into out).
+    """
+    if out is None:
+        out = np.empty((len(boards), FEATURE_SIZE), dtype=np.float32)
+    masks = np.empty((len(boards), 13), dtype=np.uint64)
+    for i, board in enumerate(boards):
+        _channel_masks(board, masks[i])
+        _tail_features(board, out[i, PLANE_FEATURES:])
+    out[:, :PLANE_FEATURES] = _unpack_planes(masks)
+    return out
+
+# Policy layout: 90 move types per from-square
+MOVES_PER_SQUARE = 90
+POLICY_SIZE = 64 * MOVES_PER_SQUARE
+# Move geometry as (rank step, file step), in the order the policy uses
+DIRECTION_VECTORS = [
+    (-1, 0), (-1, 1), (0, 1), (1, 1),
+    (1, 0), (1, -1), (0, -1), (-1, -1)
+]
+KNIGHT_MOVES = [
+    (-2, -1), (-2, 1), (-1, -2), (-1, 2),
+    (1, -2), (1, 2), (2, -1), (2, 1)
+]
+PROMOTION_ORDER = [chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT]
+# Piece kinds for the lookup table: the piece type, except that black pawns
+# (which move the other way) get their own kind 0
+BLACK_PAWN = 0
+NUM_KINDS = 7
+NUM_PROMOTIONS = 7  # None (0) and every piece type, indexed by move.promotion
+
+
+def _square_offset(square, rank_step, file_step):
+    rank = chess.square_rank(square) + rank_step
+    file = chess.square_file(square) + file_step
+    return chess.square(file, rank) if 0 <= rank < 8 and 0 <= file < 8 else None
+
+
+def _build_move_tables():
+    """
+    Policy index for every (piece kind, from, to, promotion), -1 where the
+    scheme has none; and the inverse, index -> (from, to, promotion) for
+    each color (pawn moves depend on it), with to = -1 off the board.
+    """
+    index_table = np.full((NUM_KINDS, 64, 64, NUM_PROMOTIONS), -1, dtype=np.int16)
+    index_to_to = np.full((2, POLICY_SIZE), -1, dtype=np.int8)
+    index_to_promotion = np.zeros(POLICY_SIZE, dtype=np.int8)
+
+    def add(kinds, from_sq, to_sq, subindex, promotions=range(NUM_PROMOTIONS)):
+        for kind in kinds:
+            for promotion in promotions:
+                index_table[kind, from_sq, to_sq, promotion] = from_sq * MOVES_PER_SQUARE + subindex
+
+    for from_sq in chess.SQUARES:
+        base = from_sq * MOVES_PER_SQUARE
+        for d_idx, (dr, df) in enumerate(DIRECTION_VECTORS):
+            kinds = [chess.QUEEN, chess.ROOK if d_idx % 2 == 0 else chess.BISHOP]
+            for step in range(1, 8):
+                to_sq = _square_offset(from_sq, dr * step, df * step)
+                if to_sq is None:
+                    break
+                subindex = d_idx * 7 + step - 1
+                add(kinds, from_sq, to_sq, subindex)
+                index_to_to[:, base + subindex] = to_sq
+        for k_idx, (kr, kf) in enumerate(KNIGHT_MOVES):
+            to_sq = _square_offset(from_sq, kr, kf)
+            if to_sq is not None:
+                add([chess.KNIGHT], from_sq, to_sq, 56 + k_idx)
+                index_to_to[:, base + 56 + k_idx] = to_sq
+        for km_idx, (kr, kf) in enumerate(DIRECTION_VECTORS):
+            to_sq = _square_offset(from_sq, kr, kf)
+            if to_sq is not None:
+                add([chess.KING], from_sq, to_sq, 64 + km_idx)
+                index_to_to[:, base + 64 + km_idx] = to_sq
+        for subindex, file_step in ((72, 2), (73, -2)):
+            to_sq = _square_offset(from_sq, 0, file_step)
+            if to_sq is not None:
+                add([chess.KING], from_sq, to_sq, subindex)
+                index_to_to[:, base + subindex] = to_sq
+
+        for color, kind, direction, start_rank, last_rank in (
+            (int(chess.WHITE), chess.PAWN, 1, 1, 7), (int(chess.BLACK), BLACK_PAWN, -1, 6, 0)
+        ):
+            from_rank = chess.square_rank(from_sq)
+            pawn_moves = [(74, 0, direction), (76, -1, direction), (77, 1, direction)]
+            if from_rank == start_rank:
+                pawn_moves.append((75, 0, 2 * direction))
+            for subindex, file_step, rank_step in pawn_moves:
+                to_sq = _square_offset(from_sq, rank_step, file_step)
+                if to_sq is None:
+                    continue
+                index_to_to[color, base + subindex] = to_sq
+                if chess.square_rank(to_sq) != last_rank:
+                    # The promotion piece is ignored off the last rank
+                    add([kind], from_sq, to_sq, subindex)
+                    continue
+                add([kind], from_sq, to_sq, subindex, [0])
+                first_promotion = {74: 78, 76: 82, 77: 86}[subindex]
+                for promo_idx, promotion in enumerate(PROMOTION_ORDER):
+                    add([kind], from_sq, to_sq, first_promotion + promo_idx, [promotion])
+                    index_to_to[color, base + first_promotion + promo_idx] = to_sq
+                    index_to_promotion[base + first_promotion + promo_idx] = promotion
+    return index_table, index_to_to, index_to_promotion
+
+
+MOVE_INDEX_TABLE, INDEX_TO_SQUARE, INDEX_TO_PROMOTION = _build_move_tables()
+
+
+def _piece_kind(board, square):
+    piece_type = board.piece_type_at(square)
+    if piece_type == chess.PAWN and not board.occupied_co[chess.WHITE] & chess.BB_SQUARES[square]:
+        return BLACK_PAWN
+    return piece_type
 
-import chess
 
 def move_to_index(move: chess.Move, board: chess.Board) -> int:
     """
@@ -63,127 +193,41 @@ def move_to_index(move: chess.Move, board: chess.Board) -> int:
     - 78-81: Single push promotions (Q,R,B,N)
     - 82-85: Capture left promotions (Q,R,B,N)
     - 86-89: Capture right promotions (Q,R,B,N)
+    Looked up in MOVE_INDEX_TABLE, which is built once at import.
     """
-    from_sq = move.from_square
-    to_sq = move.to_square
-    piece = board.piece_at(from_sq)
-    if piece is None:
+    kind = _piece_kind(board, move.from_square)
+    if kind is None:
         raise ValueError("No piece at from_square.")
-
-    color = piece.color
-    piece_type = piece.piece_type
-
-    from_rank = from_sq // 8
-    from_file = from_sq % 8
-    to_rank = to_sq // 8
-    to_file = to_sq % 8
-
-    rank_diff = to_rank - from_rank
-    file_diff = to_file - from_file
-
-    direction_vectors = [
-        (-1, 0), (-1, 1), (0, 1), (1, 1),
-        (1, 0), (1, -1), (0, -1), (-1, -1)
-    ]
-    knight_moves = [
-        (-2, -1), (-2, 1), (-1, -2), (-1, 2),
-        (1, -2), (1, 2), (2, -1), (2, 1)
-    ]
-    king_moves = direction_vectors
-
-    move_subindex = None
-
-    # Sliding moves (Q,R,B)
-    if piece_type in [chess.QUEEN, chess.ROOK, chess.BISHOP]:
-        if piece_type == chess.ROOK:
-            valid_dirs = [0,2,4,6] # N,E,S,W
-        elif piece_type == chess.BISHOP:
-            valid_dirs = [1,3,5,7] # NE,SE,SW,NW
-        else:
-            valid_dirs = range(8) # Queen in all directions
-        for d_idx, (dr, df) in enumerate(direction_vectors):
-            if d_idx in valid_dirs:
-                step = 1
-                r, f = from_rank + dr, from_file + df
-                while 0 <= r < 8 and 0 <= f < 8 and step <= 7:
-                    if r == to_rank and f == to_file:
-                        move_subindex = d_idx * 7 + (step - 1)
-                        break
-                    r += dr
-                    f += df
-                    step += 1
-                if move_subindex is not None:
-                    break
-
-    # Knight moves
-    if move_subindex is None and piece_type == chess.KNIGHT:
-        for k_idx, (kr, kf) in enumerate(knight_moves):
-            if rank_diff == kr and file_diff == kf:
-                move_subindex = 56 + k_idx
-                break
-
-    # King normal moves
-    if move_subindex is None and piece_type == chess.KING:
-        for km_idx, (kr, kf) in enumerate(king_moves):
-            if rank_diff == kr and file_diff == kf:
-                move_subindex = 64 + km_idx
-                break
-
-    # King castling moves
-    # White kingside: e1->g1 rank_diff=0 file_diff=2
-    # White queenside: e1->c1 rank_diff=0 file_diff=-2
-    # Black kingside: e8->g8 rank_diff=0 file_diff=2
-    # Black queenside: e8->c8 rank_diff=0 file_diff=-2
-    if move_subindex is None and piece_type == chess.KING:
-        if rank_diff == 0 and file_diff == 2:
-            # Kingside castle
-            move_subindex = 72
-        elif rank_diff == 0 and file_diff == -2:
-            # Queenside castle
-            move_subindex = 73
-
-    # Pawn moves
-    if move_subindex is None and piece_type == chess.PAWN:
-        pawn_base = 74
-        if color == chess.WHITE:
-            direction = +1
-            start_rank = 1
-            last_rank = 7
-        else:
-            direction = -1
-            start_rank = 6
-            last_rank = 0
-
-        # Single push
-        if file_diff == 0 and rank_diff == direction:
-            move_subindex = pawn_base
-        # Double push
-        elif file_diff == 0 and from_rank == start_rank and rank_diff == 2*direction:
-            move_subindex = pawn_base + 1
-        # Capture left/right
-        elif rank_diff == direction and abs(file_diff) == 1:
-            if file_diff == -1:
-                move_subindex = pawn_base + 2
-            else:
-                move_subindex = pawn_base + 3
-
-        # Promotions
-        if move_subindex is not None and to_rank == last_rank:
-            promo_map = {chess.QUEEN:0, chess.ROOK:1, chess.BISHOP:2, chess.KNIGHT:3}
-            if move.promotion is not None:
-                promo_idx = promo_map[move.promotion]
-                # single push promotion: pawn_base+4..+7 (78..81)
-                # capture left promotion: pawn_base+8..+11 (82..85)
-                # capture right promotion: pawn_base+12..+15 (86..89)
-                if move_subindex == pawn_base:        # single push
-                    move_subindex = pawn_base + 4 + promo_idx
-                elif move_subindex == pawn_base + 2:  # capture left
-                    move_subindex = pawn_base + 8 + promo_idx
-                elif move_subindex == pawn_base + 3:  # capture right
-                    move_subindex = pawn_base + 12 + promo_idx
-
-    if move_subindex is None:
+    index = MOVE_INDEX_TABLE[kind, move.from_square, move.to_square, move.promotion or 0]
+    if index < 0:
         raise ValueError(f"Move {move.uci()} cannot be indexed by this scheme.")
+    return int(index)
 
-    final_index = from_sq * 90 + move_subindex
-    return final_index
\ No newline at end of file
+
+def moves_to_indices(board: chess.Board, moves) -> np.ndarray:
+    """
+    move_to_index for a whole move list at once, as an int array.
+    Moves the scheme can't index get -1 instead of raising.
+    """
+    from_squares = [move.from_square for move in moves]
+    # Legal moves share from-squares, so look each piece up once
+    kind_at = {square: _piece_kind(board, square) for square in set(from_squares)}
+    kinds = np.array([kind_at[square] if kind_at[square] is not None else -1 for square in from_squares],
+                     dtype=np.intp)
+    indices = MOVE_INDEX_TABLE[
+        kinds, from_squares, [move.to_square for move in moves], [move.promotion or 0 for move in moves]
+    ].astype(np.intp)
+    # No piece on the from-square: the lookup above used the last kind, drop it
+    indices[kinds < 0] = -1
+    return indices
+
+
+def index_to_move(index: int, color: chess.Color) -> chess.Move:
+    """
+    The move a policy index stands for, for the given side to move.
+    Returns None for indices that point off the board.
+    """
+    to_square = int(INDEX_TO_SQUARE[int(color), index])
+    if to_square < 0:
+        return None
+    return chess.Move(index // MOVES_PER_SQUARE, to_square, int(INDEX_TO_PROMOTION[index]) or None)
@@ -0,0 +1,28 @@
+import importlib
+
+# Submodule each public name comes from. They are imported on first use, so
+# e.g. ai.search.limits can be loaded without numpy and the tables.
+_EXPORTS = {
+    "transposition_table": (
+        "TranspositionTable", "EXACT", "LOWER_BOUND", "UPPER_BOUND", "position_key", "bound_flag",
+    ),
+    "shared_transposition_table": ("SharedTranspositionTable",),
+    "quiescence": ("QuiescenceSearch", "static_exchange_evaluation"),
+    "move_ordering": ("MoveOrderer",),
+    "limits": ("SearchLimits", "SearchTimeout", "MAX_SEARCH_DEPTH"),
+    "search_state": ("SearchState", "compact_board", "restore_board"),
+    "leaf_batch": ("LeafBatcher", "LEAF_BATCH_SIZE"),
+    "mcts_tree": ("MCTSTree", "NODE_BYTES"),
+    "eval_cache": ("EvalCache", "EVAL_CACHE_SIZE"),
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
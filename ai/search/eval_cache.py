@@ -0,0 +1,63 @@
+from collections import OrderedDict
+
+# Positions kept by default; an MCTS entry (encoded moves, priors, value)
+# takes a few hundred bytes
+EVAL_CACHE_SIZE = 100_000
+
+
+class EvalCache:
+    """
+    Network results for positions that were evaluated before, keyed by
+    Zobrist hash, so a position reached again through another move order
+    costs a lookup instead of a forward pass.
+
+    Bounded to max_entries: once full, the least recently used entry is
+    dropped. The cache doesn't care what an entry holds.
+    """
+
+    def __init__(self, max_entries=EVAL_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self):
+        """
+        Fraction of lookups since the last reset that found their position.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {
+            "cache_entries": len(self.entries),
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "cache_hit_rate": self.hit_rate(),
+        }
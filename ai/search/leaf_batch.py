@@ -0,0 +1,52 @@
+# Default number of frontier children scored per forward pass
+LEAF_BATCH_SIZE = 4
+
+
+class LeafBatcher:
+    """
+    Scores the children of frontier nodes (depth 1) in batches.
+
+    Instead of one forward pass per leaf, the children are evaluated
+    batch_size at a time, in the order the search will visit them. Batches
+    are only built when the search reaches them, so a beta cutoff on an
+    early child doesn't pay for the rest.
+    """
+
+    def __init__(self, evaluate_batch, batch_size=LEAF_BATCH_SIZE):
+        self.evaluate_batch = evaluate_batch
+        self.batch_size = batch_size
+        self.batches = 0
+        self.boards = 0
+
+    def child_evals(self, board, moves):
+        """
+        Yields the static eval (White's view) of the position after each move.
+        Call next() before pushing the move, while the board is still at the parent.
+        """
+        for start in range(0, len(moves), self.batch_size):
+            children = []
+            for move in moves[start:start + self.batch_size]:
+                board.push(move)
+                children.append(board.copy(stack=False))
+                board.pop()
+            self.batches += 1
+            self.boards += len(children)
+            for score in self.evaluate_batch(children):
+                yield float(score)
+
+    def add_stats(self, stats):
+        """
+        Adds counters reported by a worker process.
+        """
+        self.batches += stats["leaf_batches"]
+        self.boards += stats["batched_leaves"]
+
+    def reset_stats(self):
+        self.batches = 0
+        self.boards = 0
+
+    def stats(self):
+        return {
+            "leaf_batches": self.batches,
+            "batched_leaves": self.boards,
+        }
@@ -0,0 +1,113 @@
+import time
+
+# Depth cap for searches bounded only by time or nodes
+MAX_SEARCH_DEPTH = 64
+# With a clock but no moves-to-go, assume this many moves are left
+DEFAULT_MOVES_TO_GO = 30
+# Keep this much of the clock in reserve (seconds)
+CLOCK_SAFETY_MARGIN = 0.05
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside a search when its limits run out.
+    The iterative deepening loop catches it and keeps the best move so far.
+    """
+    pass
+
+
+class SearchLimits:
+    """
+    How long a search may run. Any combination can be given; the search stops
+    at whichever runs out first.
+
+    - depth: maximum depth (or nothing, to search until time/nodes run out)
+    - movetime: seconds for this move
+    - nodes: node budget (simulations for MCTS)
+    - deadline: absolute time.time() to stop at
+    - time_left / increment / moves_to_go: a game clock; a slice of it is
+      allotted to this move
+    """
+
+    def __init__(self, depth=None, movetime=None, nodes=None, deadline=None,
+                 time_left=None, increment=0.0, moves_to_go=None):
+        self.depth = depth
+        self.movetime = movetime
+        self.nodes = nodes
+        self.deadline = deadline
+        self.time_left = time_left
+        self.increment = increment
+        self.moves_to_go = moves_to_go
+
+        self.start_time = None
+        self.stop_time = None
+        self.check_interval = 1
+        self.calls_until_check = 0
+        self.stopped = False
+
+    def is_bounded(self):
+        """
+        True if the search is bounded by something other than depth.
+        """
+        return any(limit is not None for limit in (self.movetime, self.nodes, self.deadline, self.time_left))
+
+    def allotted_time(self):
+        """
+        Seconds to spend on this move given the clock, or None without a clock.
+        """
+        if self.time_left is None:
+            return None
+        moves_to_go = self.moves_to_go or DEFAULT_MOVES_TO_GO
+        budget = self.time_left / moves_to_go + self.increment * 0.8
+        return max(0.0, min(budget, self.time_left - CLOCK_SAFETY_MARGIN))
+
+    def start(self, check_interval=16):
+        """
+        Start the clock for one search. The time is only read once every
+        check_interval calls to should_stop, so use 1 for expensive nodes.
+        Returns self, so it can be chained.
+        """
+        self.start_time = time.time()
+        stop_times = []
+        if self.movetime is not None:
+            stop_times.append(self.start_time + self.movetime)
+        if self.deadline is not None:
+            stop_times.append(self.deadline)
+        allotted = self.allotted_time()
+        if allotted is not None:
+            stop_times.append(self.start_time + allotted)
+        self.stop_time = min(stop_times) if stop_times else None
+
+        self.check_interval = check_interval
+        self.calls_until_check = 0
+        self.stopped = False
+        return self
+
+    def should_stop(self, nodes=0):
+        """
+        Cheap check, meant to be called at every node.
+        """
+        if self.stopped:
+            return True
+        if self.nodes is not None and nodes >= self.nodes:
+            self.stopped = True
+        elif self.stop_time is not None:
+            self.calls_until_check -= 1
+            if self.calls_until_check <= 0:
+                self.calls_until_check = self.check_interval
+                self.stopped = time.time() >= self.stop_time
+        return self.stopped
+
+    def elapsed(self):
+        return time.time() - self.start_time if self.start_time is not None else 0.0
+
+    def without_nodes(self):
+        """
+        A copy with only the time limits, for pool workers (the node budget
+        is tracked by the main process).
+        """
+        limits = SearchLimits(depth=self.depth)
+        limits.stop_time = self.stop_time
+        limits.start_time = self.start_time
+        limits.check_interval = self.check_interval
+        return limits
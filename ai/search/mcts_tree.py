@@ -0,0 +1,244 @@
+import math
+import numpy as np
+from .transposition_table import encode_move, decode_move
+
+# Node states
+UNEXPANDED = 0
+EXPANDED = 1
+DRAWN = 2   # game over, worth 0
+LOST = 3    # game over, the side to move is mated
+
+INITIAL_CAPACITY = 4096
+# Bytes per node: parent (4) + first child (4) + visits (4) + value sum (4)
+# + prior (4) + move (2) + child count (1) + state (1)
+NODE_BYTES = 24
+# Most children one node can have (num_children is a uint8)
+MAX_CHILDREN = 255
+
+
+class MCTSTree:
+    """
+    A search tree stored as a struct of numpy arrays, one slot per node.
+
+    The children of a node sit next to each other, so a node only needs the
+    index of its first child and how many there are. No boards are stored:
+    the search replays the moves from the root when it walks down.
+
+    value_sum is from the view of the player who made the move into the
+    node, so a parent simply picks the child with the best score.
+    Grows by doubling when it runs out of slots, but never past max_nodes
+    plus one expansion: once max_nodes are in use, no node is expanded.
+    """
+
+    ARRAYS = ("parent", "first_child", "num_children", "visits", "value_sum", "prior", "move", "state")
+
+    def __init__(self, capacity=INITIAL_CAPACITY, max_nodes=None):
+        self.max_nodes = max_nodes
+        if max_nodes is not None:
+            capacity = min(capacity, max_nodes + MAX_CHILDREN)
+        self.capacity = capacity
+        self.parent = np.full(capacity, -1, dtype=np.int32)
+        self.first_child = np.zeros(capacity, dtype=np.int32)
+        self.num_children = np.zeros(capacity, dtype=np.uint8)
+        self.visits = np.zeros(capacity, dtype=np.int32)
+        self.value_sum = np.zeros(capacity, dtype=np.float32)
+        self.prior = np.zeros(capacity, dtype=np.float32)
+        self.move = np.zeros(capacity, dtype=np.uint16)
+        self.state = np.zeros(capacity, dtype=np.uint8)
+        self.root = 0
+        self.size = 1
+
+    def _grow(self, needed):
+        capacity = max(2 * self.capacity, needed)
+        if self.max_nodes is not None:
+            capacity = max(min(capacity, self.max_nodes + MAX_CHILDREN), needed)
+        for name in self.ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def expanded(self, node):
+        return self.state[node] == EXPANDED
+
+    def full(self):
+        return self.max_nodes is not None and self.size >= self.max_nodes
+
+    def children(self, node):
+        """
+        Index range of a node's children.
+        """
+        first = self.first_child[node]
+        return range(first, first + self.num_children[node])
+
+    def add_children(self, node, action_priors):
+        """
+        Appends one child per (move, prior) pair as a contiguous block.
+        """
+        moves, priors = self.encode_priors(action_priors)
+        self.add_encoded_children(node, moves, priors)
+
+    @staticmethod
+    def encode_priors(action_priors):
+        """
+        (move, prior) pairs as an array of packed moves and one of priors.
+        """
+        moves = np.array([encode_move(move) for move, _ in action_priors], dtype=np.uint16)
+        priors = np.array([prior for _, prior in action_priors], dtype=np.float32)
+        return moves, priors
+
+    def add_encoded_children(self, node, moves, priors):
+        """
+        Like add_children, with the moves already packed.
+        Does nothing once the tree is full; the node stays a leaf.
+        """
+        if self.full():
+            return
+        count = len(moves)
+        if self.size + count > self.capacity:
+            self._grow(self.size + count)
+        first = self.size
+        block = slice(first, first + count)
+        self.parent[block] = node
+        self.first_child[block] = 0
+        self.num_children[block] = 0
+        self.visits[block] = 0
+        self.value_sum[block] = 0.0
+        self.state[block] = UNEXPANDED
+        self.move[block] = moves
+        self.prior[block] = priors
+        self.first_child[node] = first
+        self.num_children[node] = count
+        self.state[node] = EXPANDED
+        self.size += count
+
+    def value(self, node):
+        visits = self.visits[node]
+        return float(self.value_sum[node]) / visits if visits else 0.0
+
+    def select_child(self, node, c_puct):
+        """
+        The child with the highest PUCT score (q + u), in one pass over the
+        children's slices of the arrays.
+        """
+        first = int(self.first_child[node])
+        block = slice(first, first + int(self.num_children[node]))
+        visits = self.visits[block]
+        # An unvisited child has value_sum 0, so dividing by 1 gives q = 0
+        q = self.value_sum[block] / np.maximum(visits, 1)
+        u = (c_puct * math.sqrt(max(1, int(self.visits[node])))) * self.prior[block] / (1 + visits)
+        return first + int((q + u).argmax())
+
+    def backup(self, path, leaf_value, virtual_loss=None):
+        """
+        Adds a leaf value (side to move's view) to every node on the path at
+        once, flipping the sign each ply since a node's value is for the
+        player who moved into it. If the path still carries a virtual loss,
+        its visits are already counted, so only the loss is taken back.
+        """
+        path = np.asarray(path)
+        values = np.full(len(path), leaf_value, dtype=np.float32)
+        values[::-2] = -leaf_value
+        if virtual_loss is None:
+            self.visits[path] += 1
+        else:
+            values += virtual_loss
+        self.value_sum[path] += values
+
+    def get_move(self, node):
+        return decode_move(int(self.move[node]))
+
+    def find_child(self, node, move):
+        """
+        Index of the child reached by move, or None.
+        """
+        if not self.expanded(node):
+            return None
+        first = self.first_child[node]
+        matches = np.flatnonzero(self.move[first:first + self.num_children[node]] == encode_move(move))
+        return first + int(matches[0]) if len(matches) else None
+
+    def extract(self, node):
+        """
+        Copies the subtree under node into a new, compact tree with node as
+        its root, dropping everything else.
+        """
+        tree = MCTSTree(max_nodes=self.max_nodes)
+        for name in ("visits", "value_sum", "prior", "move", "state"):
+            getattr(tree, name)[0] = getattr(self, name)[node]
+        pending = [(node, 0)]
+        while pending:
+            old, new = pending.pop()
+            if self.state[old] != EXPANDED:
+                continue
+            first = self.first_child[old]
+            count = int(self.num_children[old])
+            if tree.size + count > tree.capacity:
+                tree._grow(tree.size + count)
+            new_first = tree.size
+            old_block = slice(first, first + count)
+            new_block = slice(new_first, new_first + count)
+            for name in ("visits", "value_sum", "prior", "move", "state"):
+                getattr(tree, name)[new_block] = getattr(self, name)[old_block]
+            tree.parent[new_block] = new
+            tree.first_child[new] = new_first
+            tree.num_children[new] = count
+            tree.size += count
+            pending.extend(
+                (first + i, new_first + i) for i in np.flatnonzero(self.state[old_block] == EXPANDED)
+            )
+        return tree
+
+    def merge(self, other, base_visits, base_values):
+        """
+        Adds what other learned to this tree. other started as a copy of this
+        tree when it had base_visits and base_values (same node indices) and
+        was searched further elsewhere; only the visits and values it added
+        since are counted. Nodes it expanded are added here too, as long as
+        the tree has room.
+        """
+        shared = len(base_visits)
+        pending = [(other.root, self.root)]
+        while pending:
+            theirs, ours = pending.pop()
+            visits = int(other.visits[theirs])
+            value = float(other.value_sum[theirs])
+            if theirs < shared:
+                visits -= int(base_visits[theirs])
+                value -= float(base_values[theirs])
+            if visits <= 0:
+                # Nothing new went through this node, so nothing below it changed either
+                continue
+            self.visits[ours] += visits
+            self.value_sum[ours] += value
+            if other.state[theirs] != EXPANDED:
+                if self.state[ours] == UNEXPANDED:
+                    self.state[ours] = other.state[theirs]
+                continue
+            first = int(other.first_child[theirs])
+            block = slice(first, first + int(other.num_children[theirs]))
+            if self.state[ours] == UNEXPANDED:
+                self.add_encoded_children(ours, other.move[block], other.prior[block])
+            if not self.expanded(ours):
+                continue
+            our_first = int(self.first_child[ours])
+            children = {int(move): our_first + i
+                        for i, move in enumerate(self.move[our_first:our_first + int(self.num_children[ours])])}
+            pending.extend((first + i, children[int(move)]) for i, move in enumerate(other.move[block])
+                           if int(move) in children)
+
+    def __getstate__(self):
+        # Only the slots in use are worth sending to another process
+        state = self.__dict__.copy()
+        for name in self.ARRAYS:
+            state[name] = state[name][:self.size].copy()
+        state["capacity"] = self.size
+        return state
+
+    def memory_usage(self):
+        return {
+            "nodes": self.size,
+            "capacity": self.capacity,
+            "tree_bytes": sum(getattr(self, name).nbytes for name in self.ARRAYS),
+        }
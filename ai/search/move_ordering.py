@@ -0,0 +1,139 @@
+import chess
+
+# Rough piece values for MVV-LVA (most valuable victim, least valuable attacker)
+MVV_LVA_VALUES = {
+    chess.PAWN: 1,
+    chess.KNIGHT: 3,
+    chess.BISHOP: 3,
+    chess.ROOK: 5,
+    chess.QUEEN: 9,
+    chess.KING: 10
+}
+
+# Score bands, so each kind of move stays in its own group
+HASH_MOVE_SCORE = 1_000_000
+CAPTURE_SCORE = 100_000
+PROMOTION_SCORE = 90_000
+KILLER_SCORES = (80_000, 79_000)
+COUNTERMOVE_SCORE = 70_000
+# History scores are halved whenever one passes this, keeping them under the bands above
+HISTORY_LIMIT = 60_000
+
+
+class MoveOrderer:
+    """
+    Orders moves for alpha-beta style searches without calling gives_check.
+
+    Order: hash move, captures by MVV-LVA, queen promotions, the two killer
+    moves stored for this ply, the countermove to the opponent's last move,
+    then remaining quiet moves by their history score.
+
+    Call record_cutoff whenever a move causes a beta cutoff; that's what
+    feeds killers, history and countermoves, and the cutoff statistics.
+    """
+
+    def __init__(self):
+        self.killers = {}
+        # Butterfly history: [color][from][to], flattened
+        self.history = [0] * (2 * 64 * 64)
+        # Countermoves: best reply to the previous move's [from][to]
+        self.countermoves = [None] * (64 * 64)
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def new_search(self):
+        """
+        Forget killers (plies change meaning between moves) and fade history.
+        """
+        self.killers = {}
+        self.history = [score // 2 for score in self.history]
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def add_stats(self, stats):
+        """
+        Fold in cutoff counts gathered elsewhere (e.g. by a pool worker).
+        """
+        self.cutoffs += stats["cutoffs"]
+        self.first_move_cutoffs += stats["first_move_cutoffs"]
+
+    def order_moves(self, board, hash_move=None):
+        """
+        Returns the legal moves sorted best-first.
+        """
+        ply = board.ply()
+        killers = self.killers.get(ply, ())
+        countermove = None
+        if board.move_stack:
+            previous = board.peek()
+            countermove = self.countermoves[previous.from_square * 64 + previous.to_square]
+        history = self.history
+        color_offset = 0 if board.turn == chess.WHITE else 4096
+        their_pieces = board.occupied_co[not board.turn]
+
+        scored = []
+        for move in board.legal_moves:
+            if move == hash_move:
+                score = HASH_MOVE_SCORE
+            elif chess.BB_SQUARES[move.to_square] & their_pieces or board.is_en_passant(move):
+                victim = board.piece_type_at(move.to_square) or chess.PAWN
+                attacker = board.piece_type_at(move.from_square)
+                score = CAPTURE_SCORE + MVV_LVA_VALUES[victim] * 16 - MVV_LVA_VALUES[attacker]
+            elif move.promotion:
+                score = PROMOTION_SCORE + MVV_LVA_VALUES[move.promotion]
+            elif move in killers:
+                score = KILLER_SCORES[killers.index(move)]
+            elif move == countermove:
+                score = COUNTERMOVE_SCORE
+            else:
+                score = history[color_offset + move.from_square * 64 + move.to_square]
+            scored.append((score, move))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [move for _, move in scored]
+
+    def record_cutoff(self, board, move, depth, move_index):
+        """
+        Update the heuristics after 'move' (the move_index-th one tried)
+        caused a beta cutoff. 'board' is the position the move was played from.
+        """
+        self.cutoffs += 1
+        if move_index == 0:
+            self.first_move_cutoffs += 1
+
+        # Only quiet moves feed killers, history and countermoves
+        if board.is_capture(move) or move.promotion:
+            return
+
+        ply = board.ply()
+        killers = self.killers.get(ply)
+        if killers is None:
+            self.killers[ply] = [move]
+        elif move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+
+        idx = (0 if board.turn == chess.WHITE else 4096) + move.from_square * 64 + move.to_square
+        self.history[idx] += depth * depth
+        if self.history[idx] > HISTORY_LIMIT:
+            self.history = [score // 2 for score in self.history]
+
+        if board.move_stack:
+            previous = board.peek()
+            self.countermoves[previous.from_square * 64 + previous.to_square] = move
+
+    def first_move_cutoff_rate(self):
+        """
+        Share of cutoffs caused by the first move tried; higher means better ordering.
+        """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def stats(self):
+        return {
+            "cutoffs": self.cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "first_move_cutoff_rate": self.first_move_cutoff_rate(),
+        }
@@ -0,0 +1,143 @@
+import chess
+
+# Piece values in centipawns, the same scale the evaluators return
+SEE_VALUES = {
+    chess.PAWN: 100,
+    chess.KNIGHT: 320,
+    chess.BISHOP: 330,
+    chess.ROOK: 500,
+    chess.QUEEN: 900,
+    chess.KING: 20000
+}
+
+DELTA_MARGIN = 200
+MAX_QUIESCENCE_DEPTH = 8
+
+
+def captured_piece_type(board: chess.Board, move: chess.Move):
+    """
+    The piece type a move takes (pawn for en passant), or None.
+    """
+    if board.is_en_passant(move):
+        return chess.PAWN
+    return board.piece_type_at(move.to_square)
+
+
+def static_exchange_evaluation(board: chess.Board, move: chess.Move) -> int:
+    """
+    Material balance (in centipawns, for the side to move) after both sides
+    keep recapturing on the target square with their cheapest piece, each
+    side free to stop when continuing would lose material.
+    """
+    to_square = move.to_square
+    captured = captured_piece_type(board, move)
+    gains = [SEE_VALUES[captured] if captured else 0]
+
+    on_square = board.piece_type_at(move.from_square)
+    if move.promotion:
+        gains[0] += SEE_VALUES[move.promotion] - SEE_VALUES[chess.PAWN]
+        on_square = move.promotion
+
+    occupied = board.occupied & ~chess.BB_SQUARES[move.from_square]
+    if board.is_en_passant(move):
+        occupied &= ~chess.BB_SQUARES[to_square + (-8 if board.turn == chess.WHITE else 8)]
+    side = not board.turn
+
+    while True:
+        # Recomputing with the reduced occupancy picks up x-ray attackers
+        attackers = board.attackers_mask(side, to_square, occupied) & occupied
+        if not attackers:
+            break
+        for piece_type in chess.PIECE_TYPES:
+            candidates = attackers & board.pieces_mask(piece_type, side)
+            if candidates:
+                attacker_square = chess.lsb(candidates)
+                break
+        gains.append(SEE_VALUES[on_square] - gains[-1])
+        on_square = piece_type
+        occupied &= ~chess.BB_SQUARES[attacker_square]
+        side = not side
+
+    # Walk back down: each side only takes if it's worth it
+    for i in range(len(gains) - 1, 0, -1):
+        gains[i - 1] = -max(-gains[i - 1], gains[i])
+    return gains[0]
+
+
+class QuiescenceSearch:
+    """
+    Keeps searching captures and queen promotions past the nominal depth so
+    leaves are only evaluated in quiet positions.
+
+    - Stand pat: the side to move may decline all captures, so the static
+      eval is a lower bound.
+    - Delta pruning: skip captures that can't lift the score back to alpha
+      even with a safety margin.
+    - SEE: skip captures that lose material once all recaptures are played.
+    """
+
+    def __init__(self, evaluate, delta_margin=DELTA_MARGIN, max_depth=MAX_QUIESCENCE_DEPTH):
+        self.evaluate = evaluate
+        self.delta_margin = delta_margin
+        self.max_depth = max_depth
+        self.nodes = 0
+
+    def search(self, state, alpha, beta, color, qdepth=0, stand_pat=None):
+        """
+        Fail-soft quiescence search on a SearchState.
+        stand_pat can be passed in if the static eval is already known.
+        Returns the score from the side to move's view.
+        """
+        self.nodes += 1
+        board = state.board
+        if stand_pat is None:
+            stand_pat = color * self.evaluate(board, state)
+        if stand_pat >= beta or qdepth >= self.max_depth:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+        best = stand_pat
+
+        for move, gain in self.tactical_moves(board):
+            # Delta pruning
+            if stand_pat + gain + self.delta_margin <= alpha:
+                continue
+            # Only bother with SEE when the capturing piece is worth more than its prize
+            if (SEE_VALUES[board.piece_type_at(move.from_square)] > gain
+                    and static_exchange_evaluation(board, move) < 0):
+                continue
+
+            state.push(move)
+            score = -self.search(state, -beta, -alpha, -color, qdepth + 1)
+            state.pop()
+
+            if score > best:
+                best = score
+                alpha = max(alpha, score)
+                if alpha >= beta:
+                    break
+
+        return best
+
+    def tactical_moves(self, board):
+        """
+        Captures and queen promotions, most valuable victim / least valuable
+        attacker first. Yields (move, material gain) pairs.
+        """
+        scored = []
+        to_mask = board.occupied_co[not board.turn] | chess.BB_BACKRANKS
+        if board.ep_square is not None:
+            to_mask |= chess.BB_SQUARES[board.ep_square]
+        for move in board.generate_legal_moves(chess.BB_ALL, to_mask):
+            if move.promotion and move.promotion != chess.QUEEN:
+                continue
+            captured = captured_piece_type(board, move)
+            if captured is None and not move.promotion:
+                continue
+            gain = SEE_VALUES[captured] if captured else 0
+            if move.promotion:
+                gain += SEE_VALUES[chess.QUEEN] - SEE_VALUES[chess.PAWN]
+            attacker = board.piece_type_at(move.from_square)
+            scored.append((gain * 10 - SEE_VALUES[attacker] // 100, move, gain))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [(move, gain) for _, move, gain in scored]
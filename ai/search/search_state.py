@@ -0,0 +1,187 @@
+import chess
+from chess.polyglot import POLYGLOT_RANDOM_ARRAY
+
+from .transposition_table import position_key
+
+TURN_KEY = POLYGLOT_RANDOM_ARRAY[780]
+CASTLING_KEYS = (
+    (chess.BB_H1, POLYGLOT_RANDOM_ARRAY[768]),
+    (chess.BB_A1, POLYGLOT_RANDOM_ARRAY[769]),
+    (chess.BB_H8, POLYGLOT_RANDOM_ARRAY[770]),
+    (chess.BB_A8, POLYGLOT_RANDOM_ARRAY[771]),
+)
+
+
+def piece_key(piece_type, color, square):
+    """
+    Polyglot key of one piece on one square.
+    """
+    return POLYGLOT_RANDOM_ARRAY[64 * ((piece_type - 1) * 2 + int(color)) + square]
+
+
+def castling_key(board):
+    key = 0
+    rights = board.clean_castling_rights()
+    for mask, value in CASTLING_KEYS:
+        if rights & mask:
+            key ^= value
+    return key
+
+
+def ep_key(board):
+    """
+    En passant file key, only when a pawn could actually take (Polyglot rule).
+    """
+    if board.ep_square is None:
+        return 0
+    if board.turn == chess.WHITE:
+        ep_mask = chess.shift_down(chess.BB_SQUARES[board.ep_square])
+    else:
+        ep_mask = chess.shift_up(chess.BB_SQUARES[board.ep_square])
+    ep_mask = chess.shift_left(ep_mask) | chess.shift_right(ep_mask)
+    if ep_mask & board.pawns & board.occupied_co[board.turn]:
+        return POLYGLOT_RANDOM_ARRAY[772 + chess.square_file(board.ep_square)]
+    return 0
+
+
+def compact_board(board):
+    """
+    The board as a FEN plus the UCI moves since the last capture or pawn
+    move, the only ones a repetition can reach back to. Cheap to send to
+    a worker, unlike the board with its whole move stack.
+    """
+    board = board.copy()
+    moves = []
+    for _ in range(min(board.halfmove_clock, len(board.move_stack))):
+        moves.append(board.pop().uci())
+    return board.fen(), moves[::-1]
+
+
+def restore_board(fen, moves):
+    board = chess.Board(fen)
+    for uci in moves:
+        board.push_uci(uci)
+    return board
+
+
+class SearchState:
+    """
+    The board being searched plus a stack of Zobrist keys kept in step with it.
+
+    Searches push and pop moves through this object instead of the board.
+    Each push updates the 64-bit key from the pieces the move touches (no
+    FEN or full rehash), and a count of keys on the stack makes repetition
+    checks O(1). The keys of earlier game positions (back to the last
+    irreversible move) are loaded at the start, so repetitions of the real
+    game are seen too.
+
+    This is also what gets handed to evaluators as their move history.
+    With an accumulator (a SimpleNetAccumulator on the same board), moves
+    are played through it, so its first-layer sums stay in step too.
+    """
+
+    def __init__(self, board: chess.Board, accumulator=None):
+        self.board = board
+        self.accumulator = accumulator
+        self.keys = []
+        self.key_counts = {}
+
+        # Positions since the last capture or pawn move can still repeat
+        previous = board.copy()
+        earlier_keys = []
+        for _ in range(min(board.halfmove_clock, len(board.move_stack))):
+            previous.pop()
+            earlier_keys.append(position_key(previous))
+        for key in reversed(earlier_keys):
+            self._add_key(key)
+        self._add_key(position_key(board))
+
+    @property
+    def key(self):
+        """
+        Zobrist key of the current position.
+        """
+        return self.keys[-1]
+
+    def _add_key(self, key):
+        self.keys.append(key)
+        self.key_counts[key] = self.key_counts.get(key, 0) + 1
+
+    def push(self, move: chess.Move):
+        """
+        Play a move (or chess.Move.null()) and update the key.
+        """
+        board = self.board
+        if board.chess960:
+            # Castling encodings differ; just rehash
+            self._push_board(move)
+            self._add_key(position_key(board))
+            return
+
+        key = self.keys[-1] ^ castling_key(board) ^ ep_key(board)
+        if move:
+            color = board.turn
+            from_square = move.from_square
+            to_square = move.to_square
+            piece_type = board.piece_type_at(from_square)
+            key ^= piece_key(piece_type, color, from_square)
+
+            if piece_type == chess.KING and board.is_castling(move):
+                rank = chess.square_rank(from_square)
+                if board.is_kingside_castling(move):
+                    king_to, rook_from, rook_to = 6, 7, 5
+                else:
+                    king_to, rook_from, rook_to = 2, 0, 3
+                key ^= piece_key(chess.KING, color, chess.square(king_to, rank))
+                key ^= piece_key(chess.ROOK, color, chess.square(rook_from, rank))
+                key ^= piece_key(chess.ROOK, color, chess.square(rook_to, rank))
+            else:
+                if piece_type == chess.PAWN and board.is_en_passant(move):
+                    captured_square = to_square - 8 if color == chess.WHITE else to_square + 8
+                    key ^= piece_key(chess.PAWN, not color, captured_square)
+                else:
+                    captured = board.piece_type_at(to_square)
+                    if captured:
+                        key ^= piece_key(captured, not color, to_square)
+                key ^= piece_key(move.promotion or piece_type, color, to_square)
+
+        self._push_board(move)
+        key ^= TURN_KEY ^ castling_key(board) ^ ep_key(board)
+        self._add_key(key)
+
+    def _push_board(self, move):
+        if self.accumulator is not None:
+            self.accumulator.push(move)
+        else:
+            self.board.push(move)
+
+    def pop(self):
+        """
+        Undo the last move.
+        """
+        key = self.keys.pop()
+        count = self.key_counts[key] - 1
+        if count:
+            self.key_counts[key] = count
+        else:
+            del self.key_counts[key]
+        if self.accumulator is not None:
+            return self.accumulator.pop()
+        return self.board.pop()
+
+    def is_repetition(self):
+        """
+        True if the current position already occurred (game or search line).
+        Inside a search one repetition is enough to score it as a draw.
+        """
+        return self.key_counts[self.keys[-1]] > 1
+
+    def is_draw(self):
+        """
+        Draws a search should score as 0 without searching further:
+        repetition, the 50-move rule or insufficient material.
+        """
+        board = self.board
+        return (self.is_repetition()
+                or board.halfmove_clock >= 100
+                or board.is_insufficient_material())
@@ -0,0 +1,173 @@
+import struct
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .transposition_table import TranspositionTable, encode_move, decode_move, NO_MOVE
+
+# Each slot is two 64-bit words: (key ^ data, data)
+SHARED_ENTRY_BYTES = 16
+# One header word in front of the slots holds the shared search age
+HEADER_WORDS = 1
+
+
+def pack_entry(depth, score, flag, move_code, age):
+    """
+    Pack an entry into one 64-bit word:
+    score (32, float bits) | move (16) | depth (8) | flag (2) | age (6).
+    """
+    score_bits = struct.unpack("<I", struct.pack("<f", score))[0]
+    return (score_bits
+            | (move_code << 32)
+            | (((depth + 128) & 0xFF) << 48)
+            | ((flag & 0x3) << 56)
+            | ((age & 0x3F) << 58))
+
+
+def unpack_entry(data):
+    """
+    Inverse of pack_entry. Returns (depth, score, flag, move_code, age).
+    """
+    score = struct.unpack("<f", struct.pack("<I", data & 0xFFFFFFFF))[0]
+    move_code = (data >> 32) & 0xFFFF
+    depth = ((data >> 48) & 0xFF) - 128
+    flag = (data >> 56) & 0x3
+    age = (data >> 58) & 0x3F
+    return depth, score, flag, move_code, age
+
+
+def _attach(name):
+    """
+    Attach to an existing block without letting this process' resource
+    tracker claim it (the owner is responsible for unlinking).
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 has no track flag, so skip the registration by hand
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _release(shm, owner):
+    if owner:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+    try:
+        shm.close()
+    except BufferError:
+        # Array views are still alive; the mapping goes away with them
+        pass
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """
+    A transposition table living in a shared memory block, so every search
+    worker process reads and writes the same entries without locks.
+
+    Each slot stores the packed entry and the key XOR-ed with it. A reader only
+    trusts a slot when both words agree, so a slot torn by two processes
+    writing at once just looks like a miss instead of returning garbage.
+
+    The process that creates the table owns the block and unlinks it on
+    close(); pickling the table (e.g. into a Pool worker) only sends the block
+    name, and the worker attaches to the same memory.
+    """
+
+    def __init__(self, size_mb=16, name=None):
+        self.size_mb = size_mb
+        num_entries = max(1, (size_mb * 1024 * 1024) // SHARED_ENTRY_BYTES)
+        self.num_entries = 1 << (num_entries.bit_length() - 1)
+        self.mask = self.num_entries - 1
+        nbytes = (HEADER_WORDS + 2 * self.num_entries) * 8
+
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            self.shm = _attach(name)
+
+        words = np.ndarray((HEADER_WORDS + 2 * self.num_entries,), dtype=np.uint64, buffer=self.shm.buf)
+        self.header = words[:HEADER_WORDS]
+        slots = words[HEADER_WORDS:].reshape(self.num_entries, 2)
+        self.checks = slots[:, 0]
+        self.data = slots[:, 1]
+        if self.owner:
+            words.fill(0)
+
+        self.reset_stats()
+        self._finalizer = weakref.finalize(self, _release, self.shm, self.owner)
+
+    def __getstate__(self):
+        return {"size_mb": self.size_mb, "name": self.shm.name}
+
+    def __setstate__(self, state):
+        self.__init__(state["size_mb"], name=state["name"])
+
+    @property
+    def age(self):
+        return int(self.header[0]) & 0x3F
+
+    @property
+    def keys(self):
+        # Recovered keys; only used for reporting
+        return self.checks ^ self.data
+
+    def close(self):
+        """
+        Detach from the block (and free it if this process created it).
+        """
+        self.header = self.checks = self.data = None
+        self._finalizer()
+
+    def new_search(self):
+        self.header[0] = np.uint64((self.age + 1) & 0x3F)
+        self.reset_stats()
+
+    def clear(self):
+        self.checks.fill(0)
+        self.data.fill(0)
+        self.header[0] = 0
+        self.reset_stats()
+
+    def probe(self, key):
+        self.probes += 1
+        idx = key & self.mask
+        data = int(self.data[idx])
+        if int(self.checks[idx]) ^ data != key or data == 0:
+            return None
+        self.hits += 1
+        depth, score, flag, move_code, _ = unpack_entry(data)
+        return depth, score, flag, decode_move(move_code)
+
+    def store(self, key, depth, score, flag, move=None):
+        idx = key & self.mask
+        old_data = int(self.data[idx])
+        same_key = old_data != 0 and int(self.checks[idx]) ^ old_data == key
+        if old_data != 0 and not same_key:
+            old_depth, _, _, _, old_age = unpack_entry(old_data)
+            if old_age == self.age and depth < old_depth:
+                return
+
+        if move is not None:
+            move_code = encode_move(move)
+        elif same_key:
+            move_code = unpack_entry(old_data)[3]
+        else:
+            move_code = NO_MOVE
+
+        data = pack_entry(depth, score, flag, move_code, self.age)
+        self.data[idx] = data
+        self.checks[idx] = key ^ data
+        self.stores += 1
+
+    def fill_ratio(self):
+        return int(np.count_nonzero(self.data)) / self.num_entries
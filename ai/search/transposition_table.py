@@ -0,0 +1,190 @@
+import chess
+import chess.polyglot
+import numpy as np
+
+# Bound flags stored alongside every score
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# Bytes per entry: key (8) + score (4) + depth (2) + move (2) + flag (1) + age (1)
+ENTRY_BYTES = 18
+NO_MOVE = 0
+
+
+def position_key(board: chess.Board) -> int:
+    """
+    64-bit Zobrist key for a position (same scheme as Polyglot opening books).
+    """
+    return chess.polyglot.zobrist_hash(board)
+
+
+def bound_flag(score, alpha, beta):
+    """
+    Which kind of bound a fail-soft score is for the window it was searched with.
+    """
+    if score <= alpha:
+        return UPPER_BOUND
+    if score >= beta:
+        return LOWER_BOUND
+    return EXACT
+
+
+def encode_move(move: chess.Move) -> int:
+    """
+    Pack a move into 16 bits: from (6) | to (6) | promotion (3).
+    A null move would pack to 0, so 0 is used as "no move".
+    """
+    return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+
+def decode_move(code: int):
+    """
+    Turn a packed move back into a chess.Move (or None for "no move").
+    """
+    if code == NO_MOVE:
+        return None
+    promotion = (code >> 12) & 0x7
+    return chess.Move(code & 0x3F, (code >> 6) & 0x3F, promotion or None)
+
+
+class TranspositionTable:
+    """
+    A fixed-size hash table of search results keyed by Zobrist hashes.
+    Every slot is preallocated in numpy arrays, so memory stays flat no matter
+    how long the game runs. Each entry keeps the bound type, depth, score and
+    the best move found, which search algorithms can use to try that move first.
+
+    Replacement is depth-preferred with aging: a slot is overwritten if it is
+    empty, holds the same position, was written during an older search, or
+    was searched less deeply than the new result.
+    """
+
+    def __init__(self, size_mb=16):
+        self.size_mb = size_mb
+        # Round down to a power of two so the slot index is a cheap mask
+        num_entries = max(1, (size_mb * 1024 * 1024) // ENTRY_BYTES)
+        self.num_entries = 1 << (num_entries.bit_length() - 1)
+        self.mask = self.num_entries - 1
+
+        self.keys = np.zeros(self.num_entries, dtype=np.uint64)
+        self.scores = np.zeros(self.num_entries, dtype=np.float32)
+        self.depths = np.zeros(self.num_entries, dtype=np.int16)
+        self.moves = np.zeros(self.num_entries, dtype=np.uint16)
+        self.flags = np.zeros(self.num_entries, dtype=np.uint8)
+        self.ages = np.zeros(self.num_entries, dtype=np.uint8)
+
+        self.age = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def __getstate__(self):
+        # Tables are process-local: only ship the configuration to workers
+        return {"size_mb": self.size_mb}
+
+    def __setstate__(self, state):
+        self.__init__(state["size_mb"])
+
+    def new_search(self):
+        """
+        Start a new search generation so older entries become replaceable.
+        """
+        self.age = (self.age + 1) & 0xFF
+        self.reset_stats()
+
+    def clear(self):
+        """
+        Wipe every entry (e.g. when starting a new game).
+        """
+        self.keys.fill(0)
+        self.scores.fill(0)
+        self.depths.fill(0)
+        self.moves.fill(0)
+        self.flags.fill(0)
+        self.ages.fill(0)
+        self.age = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def add_stats(self, stats):
+        """
+        Adds counters reported by a worker process.
+        """
+        self.probes += stats["tt_probes"]
+        self.hits += stats["tt_hits"]
+        self.stores += stats["tt_stores"]
+
+    def probe(self, key):
+        """
+        Look up a position.
+        Returns (depth, score, flag, move) or None if the position isn't stored.
+        """
+        self.probes += 1
+        idx = key & self.mask
+        if int(self.keys[idx]) != key:
+            return None
+        self.hits += 1
+        return (
+            int(self.depths[idx]),
+            float(self.scores[idx]),
+            int(self.flags[idx]),
+            decode_move(int(self.moves[idx])),
+        )
+
+    def store(self, key, depth, score, flag, move=None):
+        """
+        Save a search result, respecting the replacement scheme.
+        """
+        idx = key & self.mask
+        stored_key = int(self.keys[idx])
+        if (stored_key != 0 and stored_key != key
+                and self.ages[idx] == self.age and depth < self.depths[idx]):
+            return
+
+        # Keep the old best move if the new result didn't find one
+        if move is not None:
+            self.moves[idx] = encode_move(move)
+        elif stored_key != key:
+            self.moves[idx] = NO_MOVE
+
+        self.keys[idx] = key
+        self.scores[idx] = score
+        self.depths[idx] = depth
+        self.flags[idx] = flag
+        self.ages[idx] = self.age
+        self.stores += 1
+
+    def hit_rate(self):
+        """
+        Fraction of probes in the current search that found their position.
+        """
+        return self.hits / self.probes if self.probes else 0.0
+
+    def fill_ratio(self):
+        """
+        Fraction of slots currently holding an entry.
+        """
+        return int(np.count_nonzero(self.keys)) / self.num_entries
+
+    def counters(self):
+        """
+        The counters a worker sends back; see add_stats.
+        """
+        return {"tt_probes": self.probes, "tt_hits": self.hits, "tt_stores": self.stores}
+
+    def stats(self):
+        """
+        Summary numbers for the current search.
+        """
+        return {
+            "tt_size_mb": self.size_mb,
+            "tt_entries": self.num_entries,
+            **self.counters(),
+            "tt_hit_rate": self.hit_rate(),
+            "tt_fill_ratio": self.fill_ratio(),
+        }
@@ -1,12 +1,9 @@
-from ai.algorithms.heuristic import Heuristic
-from ai.algorithms.negamax_alpha_beta import NegamaxAlphaBeta
-from ai.algorithms.idpvs import IDPVS
-from ai.algorithms.mcts_policy_guided import MCTSPolicyGuided
-
 def select_algorithm():
     """
     Choose which AI algorithm to use.
     Default parallel mode is now True for algorithms that support it.
+    Each algorithm is imported only once it is picked, so the menu shows up
+    without loading torch or any model.
     """
     print("\nSelect an AI algorithm:")
     print("1. Heuristic (simple evaluation)")
@@ -17,22 +14,26 @@ def select_algorithm():
     choice = input("Enter your choice (1-4): ").strip()
 
     if choice == "1":
+        from ai.algorithms.heuristic import Heuristic
         # Heuristic doesn't support parallel
         return Heuristic()
 
     elif choice == "2":
+        from ai.algorithms.negamax_alpha_beta import NegamaxAlphaBeta
         depth = int(input("Enter search depth for Negamax (default: 3): ") or 3)
         parallel_input = input("Run in parallel mode? (Y/n, default: Y): ").strip().lower()
         parallel = (parallel_input != 'n')
         return NegamaxAlphaBeta(depth=depth, parallel=parallel)
 
     elif choice == "3":
+        from ai.algorithms.idpvs import IDPVS
         depth = int(input("Enter search depth for IDPVS (default: 3): ") or 3)
         parallel_input = input("Run in parallel mode? (Y/n, default: Y): ").strip().lower()
         parallel = (parallel_input != 'n')
         return IDPVS(depth=depth, parallel=parallel)
 
     elif choice == "4":
+        from ai.algorithms.mcts_policy_guided import MCTSPolicyGuided
         simulations = int(input("Enter number of simulations for MCTS (default: 1000): ") or 1000)
         parallel_input = input("Run MCTS in parallel mode? (Y/n, default: Y): ").strip().lower()
         parallel = (parallel_input != 'n')
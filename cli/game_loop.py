@@ -43,6 +43,9 @@ def play_human_vs_ai():
     else:
         print("\nGame ended prematurely.")
 
+    # Shut down any search workers the AI started
+    ai_algorithm.close()
+
 def play_ai_vs_ai():
     """
     AI vs AI:
@@ -72,3 +75,7 @@ def play_ai_vs_ai():
     # When the game ends, show who won and the last move made
     print("\nGame Over!")
     print(game.get_result())
+
+    # Shut down any search workers the AIs started
+    ai1.ai_algorithm.close()
+    ai2.ai_algorithm.close()
@@ -33,11 +33,13 @@ class AIPlayer(BasePlayer):
     An AI player that uses a given AI algorithm to pick moves.
     """
 
-    def __init__(self, ai_algorithm: AIAlgorithm):
+    def __init__(self, ai_algorithm: AIAlgorithm, limits=None):
         """
         ai_algorithm: an object that implements get_best_move(board, move_history)
+        limits: optional SearchLimits (time, nodes, clock) applied to every move
         """
         self.ai_algorithm = ai_algorithm
+        self.limits = limits
 
     def get_move(self, board: chess.Board, move_history=None):
         """
@@ -45,7 +47,7 @@ class AIPlayer(BasePlayer):
         If there's any error (e.g. AI logic), we print it and re-raise.
         """
         try:
-            return self.ai_algorithm.get_best_move(board, move_history)
+            return self.ai_algorithm.get_best_move(board, move_history, limits=self.limits)
         except Exception as e:
             print(f"AI had a problem picking a move: {e}")
             raise
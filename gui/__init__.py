@@ -26,6 +26,9 @@ def main():
             ai = AIPlayer(ai_algorithm)
             game = Game(human, ai)
 
+            # Shut down any search workers when the window closes
+            app.aboutToQuit.connect(ai_algorithm.close)
+
             board = ChessBoard(game, human_can_move=True)
             board.set_human_move_callback(lambda move: process_human_move(move, game, board))
             board.set_game_over_callback(lambda result: show_game_over(result))
@@ -48,6 +51,10 @@ def main():
             ai2 = AIPlayer(ai2_algorithm)
             game = Game(ai1, ai2)
 
+            # Shut down any search workers when the window closes
+            app.aboutToQuit.connect(ai1_algorithm.close)
+            app.aboutToQuit.connect(ai2_algorithm.close)
+
             board = ChessBoard(game, human_can_move=False)
             board.set_game_over_callback(lambda result: show_game_over(result))
 
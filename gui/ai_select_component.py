@@ -1,9 +1,5 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QComboBox, QLineEdit, QFormLayout, QGroupBox, QSpacerItem, QSizePolicy
 from PyQt5.QtCore import Qt
-from ai.algorithms.heuristic import Heuristic
-from ai.algorithms.negamax_alpha_beta import NegamaxAlphaBeta
-from ai.algorithms.idpvs import IDPVS
-from ai.algorithms.mcts_policy_guided import MCTSPolicyGuided
 
 class AISelectComponent(QWidget):
     """
@@ -93,6 +89,7 @@ class AISelectComponent(QWidget):
         """
         Construct and return an instance of the chosen algorithm with the provided settings.
         If fields are empty or invalid, defaults are used.
+        The algorithm modules (and torch with them) are only imported here.
         """
         algorithm = self.algorithm_combo.currentText()
 
@@ -111,20 +108,24 @@ class AISelectComponent(QWidget):
             return default
 
         if algorithm == "Heuristic":
+            from ai.algorithms.heuristic import Heuristic
             depth = get_int_field('depth_input', 3)
             self.selected_algorithm = Heuristic(depth=depth)
 
         elif algorithm == "NegamaxAlphaBeta":
+            from ai.algorithms.negamax_alpha_beta import NegamaxAlphaBeta
             depth = get_int_field('depth_input', 3)
             parallel = get_parallel(False)
             self.selected_algorithm = NegamaxAlphaBeta(depth=depth, parallel=parallel)
 
         elif algorithm == "IDPVS":
+            from ai.algorithms.idpvs import IDPVS
             depth = get_int_field('depth_input', 3)
             parallel = get_parallel(False)
             self.selected_algorithm = IDPVS(depth=depth, parallel=parallel)
 
         elif algorithm == "MCTSPolicyGuided":
+            from ai.algorithms.mcts_policy_guided import MCTSPolicyGuided
             simulations = get_int_field('simulations_input', 1000)
             parallel = get_parallel(False)
             self.selected_algorithm = MCTSPolicyGuided(num_simulations=simulations, parallel=parallel)
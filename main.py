@@ -1,6 +1,5 @@
 import sys
 from cli import main as cli_main
-from gui import main as gui_main
 
 def display_interface_menu():
     """
@@ -30,6 +29,8 @@ def main():
         elif choice == "2":
             print("\nAttempting to start the GUI version of ChessBot...")
             try:
+                # Imported here so a missing PyQt5 only disables the GUI
+                from gui import main as gui_main
                 gui_main()  # Launch the GUI
             except ImportError:
                 print("\nGUI not available. Please ensure all GUI dependencies are installed.\n")